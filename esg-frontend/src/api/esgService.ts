@@ -1,4 +1,5 @@
 import apiClient from './config';
+import { cachedGet, invalidateQueries, prefetch, useCachedQuery } from './queryCache';
 
 // Types
 export interface CompanyESG {
@@ -41,11 +42,139 @@ export interface PredictResponse {
     predicted_esg_score: number;
 }
 
+export interface AnalyticsOverview {
+    companies: number;
+    news: number;
+    esg_score: number | null;
+    environmental_score: number | null;
+    social_score: number | null;
+    governance_score: number | null;
+    sentiment_score: number | null;
+}
+
+export interface SentimentBucket {
+    sentiment_label: string;
+    count: number;
+    average_sentiment: number;
+}
+
+export interface ScoreTrend {
+    date: string;
+    count: number;
+    esg_score: number;
+    environmental_score: number;
+    social_score: number;
+    governance_score: number;
+    sentiment_score: number;
+}
+
+export interface CompanyHistory {
+    company: string;
+    total_points: number;
+    returned_points: number;
+    timestamps: string[];
+    esg_score: number[];
+    environmental_score: number[];
+    social_score: number[];
+    governance_score: number[];
+    sentiment_score: number[];
+}
+
+export interface NewsSearchResult extends ESGNews {
+    rank: number;
+}
+
+export interface PaginatedResponse<T> {
+    count: number;
+    page: number;
+    page_size: number;
+    results: T[];
+}
+
+export interface UploadSession {
+    upload_id: string;
+    filename: string;
+    total_size: number;
+    offset: number;
+    status: 'pending' | 'processing' | 'complete' | 'failed';
+    chunk_size?: number;
+}
+
+const UPLOAD_SESSION_PREFIX = 'esg-upload:';
+const MAX_CHUNK_RETRIES = 5;
+
+// Identify a local file so an interrupted upload can be resumed after reload.
+const uploadSessionKey = (file: File) =>
+    `${UPLOAD_SESSION_PREFIX}${file.name}:${file.size}:${file.lastModified}`;
+
+const sha256Hex = async (blob: Blob): Promise<string | undefined> => {
+    if (!globalThis.crypto?.subtle) return undefined;
+    const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest))
+        .map((byte) => byte.toString(16).padStart(2, '0'))
+        .join('');
+};
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Reuse a pending server-side session for this file, or start a new one.
+const openUploadSession = async (file: File): Promise<{ session: UploadSession; chunkSize: number }> => {
+    const key = uploadSessionKey(file);
+    const saved = localStorage.getItem(key);
+    if (saved) {
+        try {
+            const { uploadId, chunkSize } = JSON.parse(saved);
+            const response = await apiClient.get<UploadSession>(`/uploads/${uploadId}/`);
+            if (response.data.status === 'pending') {
+                return { session: response.data, chunkSize };
+            }
+        } catch {
+            // Session expired or unknown: fall through and start again.
+        }
+        localStorage.removeItem(key);
+    }
+
+    const response = await apiClient.post<UploadSession>('/uploads/', {
+        filename: file.name,
+        size: file.size,
+    });
+    const chunkSize = response.data.chunk_size ?? 8 * 1024 * 1024;
+    localStorage.setItem(key, JSON.stringify({ uploadId: response.data.upload_id, chunkSize }));
+    return { session: response.data, chunkSize };
+};
+
+export interface PredictExplanation extends PredictResponse {
+    base_value: number;
+    contributions: Record<keyof PredictRequest, number>;
+    method: 'linear' | 'tree_path' | 'shapley';
+    model_version: string;
+}
+
+export interface DataQualityReport {
+    file: string;
+    target: 'company_esg' | 'news';
+    status: 'ingested' | 'rejected';
+    rows: number;
+    inserted: number;
+    quarantined: number;
+    flagged: number;
+    quarantine_file: string | null;
+    rules: {
+        rule: string;
+        fields: string[];
+        action: 'quarantine' | 'flag';
+        failed: number;
+        samples: { row: number; values: Record<string, unknown> }[];
+    }[];
+}
+
 export interface UploadResponse {
     status: string;
     companies_created?: number;
     news_created?: number;
     reports_created?: number;
+    skipped_files?: { file: string; reason: string }[];
+    quality?: DataQualityReport[];
     detail?: string;
 }
 
@@ -53,26 +182,52 @@ export interface UploadResponse {
 export const esgService = {
     // Get all companies with latest ESG scores
     getCompanies: async (): Promise<CompanyESG[]> => {
-        const response = await apiClient.get('/companies/');
-        return response.data;
+        return cachedGet<CompanyESG[]>('/companies/');
     },
 
     // Get specific company details
     getCompanyDetail: async (id: number): Promise<CompanyESG> => {
-        const response = await apiClient.get(`/companies/${id}/`);
-        return response.data;
+        return cachedGet<CompanyESG>(`/companies/${id}/`);
+    },
+
+    // Warm the cache for a company detail page the user is likely to open
+    prefetchCompanyDetail: (id: number): void => {
+        prefetch(`/companies/${id}/`);
+    },
+
+    // Get a company's score history, optionally downsampled to `points`
+    getCompanyHistory: async (
+        company: string,
+        points?: number,
+        method: 'lttb' | 'mean' = 'lttb'
+    ): Promise<CompanyHistory> => {
+        return cachedGet<CompanyHistory>(`/companies/${encodeURIComponent(company)}/history/`, {
+            params: { points, method },
+        });
     },
 
     // Get all ESG news
     getNews: async (): Promise<ESGNews[]> => {
-        const response = await apiClient.get('/news/');
-        return response.data;
+        return cachedGet<ESGNews[]>('/news/');
+    },
+
+    // Ranked full-text search over news titles and summaries
+    searchNews: async (q: string, page = 1, pageSize = 20): Promise<PaginatedResponse<NewsSearchResult>> => {
+        return cachedGet<PaginatedResponse<NewsSearchResult>>('/search/news/', {
+            params: { q, page, page_size: pageSize },
+        });
+    },
+
+    // Fuzzy search over company names
+    searchCompanies: async (q: string, page = 1, pageSize = 20): Promise<PaginatedResponse<CompanyESG>> => {
+        return cachedGet<PaginatedResponse<CompanyESG>>('/search/companies/', {
+            params: { q, page, page_size: pageSize },
+        });
     },
 
     // Get company report
     getCompanyReport: async (company: string): Promise<CompanyReport> => {
-        const response = await apiClient.get(`/reports/${encodeURIComponent(company)}/`);
-        return response.data;
+        return cachedGet<CompanyReport>(`/reports/${encodeURIComponent(company)}/`);
     },
 
     // Predict ESG score
@@ -81,25 +236,95 @@ export const esgService = {
         return response.data;
     },
 
-    // Upload ZIP file
+    // Overall averages across the latest score of every company
+    getAnalyticsOverview: async (): Promise<AnalyticsOverview> => {
+        return cachedGet<AnalyticsOverview>('/analytics/overview/');
+    },
+
+    // Top or bottom N companies by latest ESG score
+    getCompanyRanking: async (n = 5, order: 'top' | 'bottom' = 'top'): Promise<CompanyESG[]> => {
+        return cachedGet<CompanyESG[]>('/analytics/ranking/', { params: { n, order } });
+    },
+
+    // News sentiment label histogram
+    getSentimentHistogram: async (): Promise<SentimentBucket[]> => {
+        return cachedGet<SentimentBucket[]>('/analytics/sentiment/');
+    },
+
+    // Daily average scores of ingested data
+    getScoreTrends: async (days = 30): Promise<ScoreTrend[]> => {
+        return cachedGet<ScoreTrend[]>('/analytics/trends/', { params: { days } });
+    },
+
+    // Explain an ESG prediction as per-feature contributions
+    explainESG: async (data: PredictRequest): Promise<PredictExplanation> => {
+        const response = await apiClient.post('/predict/explain/', data);
+        return response.data;
+    },
+
+    // Upload ZIP file in resumable, checksummed chunks
     uploadZip: async (file: File, onProgress?: (progress: number) => void): Promise<UploadResponse> => {
-        const formData = new FormData();
-        formData.append('file', file);
-
-        const response = await apiClient.post('/upload-zip/', formData, {
-            headers: {
-                'Content-Type': 'multipart/form-data',
-            },
-            onUploadProgress: (progressEvent) => {
-                if (onProgress && progressEvent.total) {
-                    const percentCompleted = Math.round((progressEvent.loaded * 100) / progressEvent.total);
-                    onProgress(percentCompleted);
+        const key = uploadSessionKey(file);
+        const { session, chunkSize } = await openUploadSession(file);
+        let offset = session.offset;
+        let failures = 0;
+
+        while (offset < file.size) {
+            const chunk = file.slice(offset, Math.min(offset + chunkSize, file.size));
+            try {
+                const checksum = await sha256Hex(chunk);
+                const response = await apiClient.put<UploadSession>(`/uploads/${session.upload_id}/`, chunk, {
+                    headers: {
+                        'Content-Type': 'application/octet-stream',
+                        'Upload-Offset': String(offset),
+                        ...(checksum ? { 'Upload-Checksum': checksum } : {}),
+                    },
+                    timeout: 0,
+                });
+                offset = response.data.offset;
+                failures = 0;
+            } catch (err: any) {
+                if (err.response?.status === 409 && typeof err.response.data?.offset === 'number') {
+                    // Server already has more (or less) than we thought; resume from its offset.
+                    offset = err.response.data.offset;
+                    continue;
                 }
-            },
-        });
+                if (failures < MAX_CHUNK_RETRIES) {
+                    // Network errors and checksum mismatches: back off and resend.
+                    failures += 1;
+                    await sleep(500 * 2 ** failures);
+                    continue;
+                }
+                throw err;
+            }
+
+            if (onProgress) {
+                onProgress(Math.round((offset * 100) / file.size));
+            }
+        }
 
+        const response = await apiClient.post(`/uploads/${session.upload_id}/complete/`, null, {
+            timeout: 0,
+        });
+        localStorage.removeItem(key);
+        // New rows change every list, summary and search result.
+        invalidateQueries();
         return response.data;
     },
 };
 
+// Hooks for pages: cached data that updates in place when a background
+// revalidation returns something new.
+export const useAnalyticsOverview = () => useCachedQuery<AnalyticsOverview>('/analytics/overview/');
+
+export const useCompanyRanking = (n = 5, order: 'top' | 'bottom' = 'top') =>
+    useCachedQuery<CompanyESG[]>('/analytics/ranking/', { params: { n, order } });
+
+export const useCompanies = () => useCachedQuery<CompanyESG[]>('/companies/');
+
+export const useCompanyDetail = (id: number | null) =>
+    useCachedQuery<CompanyESG>(id === null ? null : `/companies/${id}/`);
+
+export const useNews = () => useCachedQuery<ESGNews[]>('/news/');
+
 export default esgService;
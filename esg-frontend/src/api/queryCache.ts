@@ -0,0 +1,195 @@
+import { useEffect, useState } from 'react';
+import type { AxiosResponse } from 'axios';
+import apiClient from './config';
+
+// Client-side GET cache shared by all pages:
+// - concurrent requests for the same URL share one in-flight promise,
+// - cached data is served immediately and revalidated in the background
+//   once older than `staleTime` (stale-while-revalidate),
+// - revalidation sends `If-None-Match`, so unchanged payloads come back as
+//   an empty 304 instead of being downloaded again.
+
+interface CacheEntry<T = unknown> {
+    data?: T;
+    etag?: string;
+    fetchedAt: number;
+    inFlight?: Promise<T>;
+}
+
+export interface QueryOptions {
+    params?: Record<string, unknown>;
+    // Age in ms after which cached data is revalidated in the background.
+    staleTime?: number;
+}
+
+export interface QueryStats {
+    requests: number;
+    notModified: number;
+    cacheHits: number;
+    dedupedRequests: number;
+    bytesReceived: number;
+}
+
+const DEFAULT_STALE_TIME = 30_000;
+
+const entries = new Map<string, CacheEntry>();
+const listeners = new Map<string, Set<(data: unknown) => void>>();
+
+// Network counters. Development builds expose them on
+// `window.__esgQueryStats` for measuring request volume in the console.
+export const queryStats: QueryStats = {
+    requests: 0,
+    notModified: 0,
+    cacheHits: 0,
+    dedupedRequests: 0,
+    bytesReceived: 0,
+};
+if (import.meta.env.DEV) {
+    (globalThis as any).__esgQueryStats = queryStats;
+}
+
+const cacheKey = (url: string, params?: Record<string, unknown>) => {
+    if (!params) return url;
+    const query = Object.entries(params)
+        .filter(([, value]) => value !== undefined)
+        .sort(([a], [b]) => a.localeCompare(b))
+        .map(([key, value]) => `${key}=${encodeURIComponent(String(value))}`)
+        .join('&');
+    return query ? `${url}?${query}` : url;
+};
+
+const notify = (key: string, data: unknown) => {
+    listeners.get(key)?.forEach((listener) => listener(data));
+};
+
+const fetchEntry = <T>(key: string, url: string, params?: Record<string, unknown>): Promise<T> => {
+    const entry = (entries.get(key) as CacheEntry<T> | undefined) ?? { fetchedAt: 0 };
+    if (entry.inFlight) {
+        queryStats.dedupedRequests += 1;
+        return entry.inFlight;
+    }
+
+    queryStats.requests += 1;
+    const request = apiClient
+        .get<T>(url, {
+            params,
+            headers: entry.etag ? { 'If-None-Match': entry.etag } : undefined,
+            validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+        })
+        .then((response: AxiosResponse<T>) => {
+            entry.fetchedAt = Date.now();
+            if (response.status === 304 && entry.data !== undefined) {
+                queryStats.notModified += 1;
+                return entry.data;
+            }
+            const length = Number(response.headers['content-length']);
+            queryStats.bytesReceived += Number.isFinite(length) ? length : 0;
+            entry.data = response.data;
+            entry.etag = response.headers['etag'];
+            notify(key, response.data);
+            return response.data;
+        })
+        .finally(() => {
+            entry.inFlight = undefined;
+        });
+
+    entry.inFlight = request;
+    entries.set(key, entry);
+    return request;
+};
+
+// Return cached data when available, revalidating it in the background once stale.
+export const cachedGet = <T>(url: string, options: QueryOptions = {}): Promise<T> => {
+    const { params, staleTime = DEFAULT_STALE_TIME } = options;
+    const key = cacheKey(url, params);
+    const entry = entries.get(key) as CacheEntry<T> | undefined;
+
+    if (entry?.data !== undefined) {
+        queryStats.cacheHits += 1;
+        if (Date.now() - entry.fetchedAt > staleTime) {
+            fetchEntry<T>(key, url, params).catch(() => undefined);
+        }
+        return Promise.resolve(entry.data);
+    }
+    return fetchEntry<T>(key, url, params);
+};
+
+// Warm the cache for a likely next request (e.g. on hover); errors are ignored.
+export const prefetch = (url: string, options: QueryOptions = {}): void => {
+    const key = cacheKey(url, options.params);
+    if (entries.get(key)?.data !== undefined || entries.get(key)?.inFlight) return;
+    fetchEntry(key, url, options.params).catch(() => undefined);
+};
+
+// Drop cached entries whose key starts with any of `prefixes` (all if none given).
+export const invalidateQueries = (...prefixes: string[]): void => {
+    for (const key of Array.from(entries.keys())) {
+        if (prefixes.length === 0 || prefixes.some((prefix) => key.startsWith(prefix))) {
+            entries.delete(key);
+        }
+    }
+};
+
+const subscribe = (key: string, listener: (data: unknown) => void) => {
+    const set = listeners.get(key) ?? new Set();
+    set.add(listener);
+    listeners.set(key, set);
+    return () => {
+        set.delete(listener);
+    };
+};
+
+interface QueryState<T> {
+    key: string | null;
+    data?: T;
+    error?: unknown;
+}
+
+// React hook: loads `url` through the cache and re-renders when a background
+// revalidation brings new data. Pass `null` to skip the request.
+export const useCachedQuery = <T>(url: string | null, options: QueryOptions = {}) => {
+    const key = url ? cacheKey(url, options.params) : null;
+    const [state, setState] = useState<QueryState<T>>({ key: null });
+    const [attempt, setAttempt] = useState(0);
+
+    useEffect(() => {
+        if (!url || !key) return;
+        let active = true;
+        const unsubscribe = subscribe(key, (data) => {
+            if (active) setState({ key, data: data as T });
+        });
+
+        cachedGet<T>(url, options)
+            .then((data) => {
+                if (active) setState({ key, data });
+            })
+            .catch((error) => {
+                if (active) setState({ key, error });
+            });
+
+        return () => {
+            active = false;
+            unsubscribe();
+        };
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [key, attempt]);
+
+    // Until the effect for a new key has run, serve whatever is cached for it.
+    const current: QueryState<T> =
+        state.key === key ? state : { key, data: key ? (entries.get(key)?.data as T | undefined) : undefined };
+
+    // Drop the cached entry and load it again (e.g. a Retry button).
+    const refetch = () => {
+        if (!key) return;
+        entries.delete(key);
+        setState({ key: null });
+        setAttempt((count) => count + 1);
+    };
+
+    return {
+        data: current.data,
+        loading: key !== null && current.data === undefined && current.error === undefined,
+        error: current.error,
+        refetch,
+    };
+};
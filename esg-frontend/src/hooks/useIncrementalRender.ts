@@ -0,0 +1,28 @@
+import { useEffect, useState } from 'react';
+import { useInView } from 'react-intersection-observer';
+
+// Render a long list in pages of `pageSize`, mounting the next page when the
+// sentinel element scrolls near the viewport. Keeps first paint cheap for
+// lists with thousands of animated cards.
+export const useIncrementalRender = <T>(items: T[], pageSize = 30) => {
+    const [count, setCount] = useState(pageSize);
+    const { ref: sentinelRef, inView } = useInView({ rootMargin: '600px 0px' });
+
+    // Start from the first page again whenever the list itself changes
+    // (new filter, sort order or data).
+    useEffect(() => {
+        setCount(pageSize);
+    }, [items, pageSize]);
+
+    useEffect(() => {
+        if (inView && count < items.length) {
+            setCount((current) => current + pageSize);
+        }
+    }, [inView, count, items.length, pageSize]);
+
+    return {
+        visibleItems: items.slice(0, count),
+        hasMore: count < items.length,
+        sentinelRef,
+    };
+};
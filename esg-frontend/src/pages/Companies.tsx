@@ -1,30 +1,21 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
 import { motion } from 'framer-motion';
 import { Link } from 'react-router-dom';
-import esgService, { CompanyESG } from '../api/esgService';
+import esgService, { CompanyESG, useCompanies } from '../api/esgService';
+import { useIncrementalRender } from '../hooks/useIncrementalRender';
 import './Companies.css';
 
+// Stable fallback so the memoised list below is not rebuilt on every render.
+const NO_COMPANIES: CompanyESG[] = [];
+
 const Companies: React.FC = () => {
-    const [companies, setCompanies] = useState<CompanyESG[]>([]);
-    const [loading, setLoading] = useState(true);
+    const { data: companies = NO_COMPANIES, loading, error } = useCompanies();
     const [searchTerm, setSearchTerm] = useState('');
     const [sortBy, setSortBy] = useState<'name' | 'esg' | 'env' | 'social' | 'gov'>('esg');
 
     useEffect(() => {
-        loadCompanies();
-    }, []);
-
-    const loadCompanies = async () => {
-        try {
-            setLoading(true);
-            const data = await esgService.getCompanies();
-            setCompanies(data);
-        } catch (err) {
-            console.error('Failed to load companies:', err);
-        } finally {
-            setLoading(false);
-        }
-    };
+        if (error) console.error('Failed to load companies:', error);
+    }, [error]);
 
     const getScoreColor = (score: number) => {
         if (score >= 80) return 'success';
@@ -32,7 +23,7 @@ const Companies: React.FC = () => {
         return 'error';
     };
 
-    const filteredAndSortedCompanies = companies
+    const filteredAndSortedCompanies = useMemo(() => companies
         .filter((company) =>
             company.company.toLowerCase().includes(searchTerm.toLowerCase())
         )
@@ -51,7 +42,9 @@ const Companies: React.FC = () => {
                 default:
                     return 0;
             }
-        });
+        }), [companies, searchTerm, sortBy]);
+
+    const { visibleItems, hasMore, sentinelRef } = useIncrementalRender(filteredAndSortedCompanies);
 
     if (loading) {
         return (
@@ -135,13 +128,14 @@ const Companies: React.FC = () => {
                     animate={{ opacity: 1 }}
                     transition={{ delay: 0.2 }}
                 >
-                    {filteredAndSortedCompanies.map((company, index) => (
+                    {visibleItems.map((company, index) => (
                         <motion.div
                             key={company.id}
                             className="company-card glass-card"
                             initial={{ opacity: 0, y: 20 }}
                             animate={{ opacity: 1, y: 0 }}
-                            transition={{ delay: index * 0.05 }}
+                            transition={{ delay: (index % 30) * 0.05 }}
+                            onMouseEnter={() => esgService.prefetchCompanyDetail(company.id)}
                         >
                             <div className="company-header">
                                 <h3>{company.company}</h3>
@@ -211,6 +205,7 @@ const Companies: React.FC = () => {
                         </motion.div>
                     ))}
                 </motion.div>
+                {hasMore && <div ref={sentinelRef} aria-hidden="true" />}
 
                 {filteredAndSortedCompanies.length === 0 && (
                     <div className="no-results">
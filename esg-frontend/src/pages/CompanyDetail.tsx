@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import {
@@ -11,33 +11,17 @@ import {
     ResponsiveContainer,
     Cell
 } from 'recharts';
-import esgService, { CompanyESG } from '../api/esgService';
+import { useCompanyDetail } from '../api/esgService';
 import './CompanyDetail.css';
 
 const CompanyDetail: React.FC = () => {
     const { id } = useParams<{ id: string }>();
-    const [company, setCompany] = useState<CompanyESG | null>(null);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState<string | null>(null);
+    const { data: company, loading, error: failure } = useCompanyDetail(id ? parseInt(id) : null);
+    const error = failure ? 'Failed to load company details.' : null;
 
     useEffect(() => {
-        if (id) {
-            loadCompany(parseInt(id));
-        }
-    }, [id]);
-
-    const loadCompany = async (companyId: number) => {
-        try {
-            setLoading(true);
-            const data = await esgService.getCompanyDetail(companyId);
-            setCompany(data);
-        } catch (err) {
-            console.error('Failed to load company:', err);
-            setError('Failed to load company details.');
-        } finally {
-            setLoading(false);
-        }
-    };
+        if (failure) console.error('Failed to load company:', failure);
+    }, [failure]);
 
     const getScoreColor = (score: number) => {
         if (score >= 80) return 'success';
@@ -1,50 +1,28 @@
-import React, { useEffect, useState } from 'react';
+import React from 'react';
 import { motion } from 'framer-motion';
 import { Link } from 'react-router-dom';
-import esgService, { CompanyESG } from '../api/esgService';
+import esgService, { useAnalyticsOverview, useCompanyRanking } from '../api/esgService';
 import './Dashboard.css';
 
 const Dashboard: React.FC = () => {
-    const [companies, setCompanies] = useState<CompanyESG[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState<string | null>(null);
-
-    useEffect(() => {
-        loadDashboardData();
-    }, []);
-
-    const loadDashboardData = async () => {
-        try {
-            setLoading(true);
-            const data = await esgService.getCompanies();
-            setCompanies(data);
-            setError(null);
-        } catch (err: any) {
-            setError(err.message || 'Failed to load dashboard data');
-        } finally {
-            setLoading(false);
-        }
+    const overviewQuery = useAnalyticsOverview();
+    const rankingQuery = useCompanyRanking(5);
+    const overview = overviewQuery.data ?? null;
+    const topCompanies = rankingQuery.data ?? [];
+    const loading = overviewQuery.loading || rankingQuery.loading;
+    const failure = (overviewQuery.error ?? rankingQuery.error) as Error | undefined;
+    const error = failure ? failure.message || 'Failed to load dashboard data' : null;
+
+    const loadDashboardData = () => {
+        overviewQuery.refetch();
+        rankingQuery.refetch();
     };
 
-    const calculateAverages = () => {
-        if (companies.length === 0) return { esg: 0, env: 0, social: 0, gov: 0 };
-
-        const totals = companies.reduce(
-            (acc, company) => ({
-                esg: acc.esg + company.esg_score,
-                env: acc.env + company.environmental_score,
-                social: acc.social + company.social_score,
-                gov: acc.gov + company.governance_score,
-            }),
-            { esg: 0, env: 0, social: 0, gov: 0 }
-        );
-
-        return {
-            esg: totals.esg / companies.length,
-            env: totals.env / companies.length,
-            social: totals.social / companies.length,
-            gov: totals.gov / companies.length,
-        };
+    const averages = {
+        esg: overview?.esg_score ?? 0,
+        env: overview?.environmental_score ?? 0,
+        social: overview?.social_score ?? 0,
+        gov: overview?.governance_score ?? 0,
     };
 
     const getScoreColor = (score: number) => {
@@ -61,9 +39,6 @@ const Dashboard: React.FC = () => {
         return 'D';
     };
 
-    const averages = calculateAverages();
-    const topCompanies = [...companies].sort((a, b) => b.esg_score - a.esg_score).slice(0, 5);
-
     if (loading) {
         return (
             <div className="dashboard-page">
@@ -128,7 +103,7 @@ const Dashboard: React.FC = () => {
                         </div>
                         <div className="overview-value">{averages.esg.toFixed(1)}</div>
                         <div className="overview-footer">
-                            <span className="overview-companies">{companies.length} companies tracked</span>
+                            <span className="overview-companies">{overview?.companies ?? 0} companies tracked</span>
                         </div>
                     </motion.div>
 
@@ -204,6 +179,7 @@ const Dashboard: React.FC = () => {
                                 key={company.id}
                                 to={`/companies/${company.id}`}
                                 className="performer-card glass-card"
+                                onMouseEnter={() => esgService.prefetchCompanyDetail(company.id)}
                             >
                                 <div className="performer-rank">#{index + 1}</div>
                                 <div className="performer-info">
@@ -1,28 +1,19 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
 import { motion } from 'framer-motion';
-import esgService, { ESGNews } from '../api/esgService';
+import { ESGNews, useNews } from '../api/esgService';
+import { useIncrementalRender } from '../hooks/useIncrementalRender';
 import './News.css';
 
+// Stable fallback so the memoised list below is not rebuilt on every render.
+const NO_NEWS: ESGNews[] = [];
+
 const News: React.FC = () => {
-    const [news, setNews] = useState<ESGNews[]>([]);
-    const [loading, setLoading] = useState(true);
+    const { data: news = NO_NEWS, loading, error } = useNews();
     const [filter, setFilter] = useState<'all' | 'positive' | 'negative' | 'neutral'>('all');
 
     useEffect(() => {
-        loadNews();
-    }, []);
-
-    const loadNews = async () => {
-        try {
-            setLoading(true);
-            const data = await esgService.getNews();
-            setNews(data);
-        } catch (err) {
-            console.error('Failed to load news:', err);
-        } finally {
-            setLoading(false);
-        }
-    };
+        if (error) console.error('Failed to load news:', error);
+    }, [error]);
 
     const getSentimentLabel = (score: number) => {
         if (score > 0.3) return 'positive';
@@ -36,10 +27,12 @@ const News: React.FC = () => {
         return 'var(--color-warning)';
     };
 
-    const filteredNews = news.filter((item) => {
+    const filteredNews = useMemo(() => news.filter((item) => {
         if (filter === 'all') return true;
         return getSentimentLabel(item.sentiment_score) === filter;
-    });
+    }), [news, filter]);
+
+    const { visibleItems, hasMore, sentinelRef } = useIncrementalRender(filteredNews);
 
     if (loading) {
         return (
@@ -111,13 +104,13 @@ const News: React.FC = () => {
                     animate={{ opacity: 1 }}
                     transition={{ delay: 0.2 }}
                 >
-                    {filteredNews.map((item, index) => (
+                    {visibleItems.map((item, index) => (
                         <motion.div
                             key={item.id}
                             className="news-card glass-card"
                             initial={{ opacity: 0, y: 20 }}
                             animate={{ opacity: 1, y: 0 }}
-                            transition={{ delay: index * 0.05 }}
+                            transition={{ delay: (index % 30) * 0.05 }}
                         >
                             <div className="news-header">
                                 <span className="news-label">{item.sentiment_label || 'News'}</span>
@@ -154,6 +147,7 @@ const News: React.FC = () => {
                         </motion.div>
                     ))}
                 </motion.div>
+                {hasMore && <div ref={sentinelRef} aria-hidden="true" />}
 
                 {filteredNews.length === 0 && (
                     <div className="no-results">
@@ -124,7 +124,7 @@ const Upload: React.FC = () => {
                                     <div className="dropzone-icon">📦</div>
                                     <h3>Drop your ZIP file here</h3>
                                     <p>or click to browse</p>
-                                    <span className="dropzone-hint">Maximum file size: 500 MB</span>
+                                    <span className="dropzone-hint">Large archives upload in resumable chunks</span>
                                 </>
                             ) : (
                                 <>
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from esg.services.lifecycle import (
+    ARCHIVE_MODELS,
+    PERIODS,
+    LifecycleError,
+    archive_rows,
+    compact_company_snapshots,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the data retention policy: compact old CompanyESG snapshots to one per "
+        "company and period, then archive rows past the archive age to compressed files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--compact-after-days",
+            type=int,
+            default=settings.ESG_RETENTION_COMPACT_AFTER_DAYS,
+            help="Compact CompanyESG snapshots older than this (0 disables).",
+        )
+        parser.add_argument("--period", choices=PERIODS, default=settings.ESG_RETENTION_PERIOD)
+        parser.add_argument(
+            "--archive-compacted",
+            action="store_true",
+            help="Write compacted-away snapshots to an archive file instead of discarding them.",
+        )
+        parser.add_argument(
+            "--archive-after-days",
+            type=int,
+            default=settings.ESG_RETENTION_ARCHIVE_AFTER_DAYS,
+            help="Archive rows older than this (0 disables).",
+        )
+        parser.add_argument(
+            "--datasets",
+            nargs="+",
+            choices=list(ARCHIVE_MODELS),
+            default=list(ARCHIVE_MODELS),
+            help="Datasets to archive.",
+        )
+        parser.add_argument("--archive-dir", default=None)
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+        parser.add_argument("--dry-run", action="store_true", help="Only report row counts.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        results = []
+
+        try:
+            if options["compact_after_days"] > 0:
+                results.append(
+                    compact_company_snapshots(
+                        now - timedelta(days=options["compact_after_days"]),
+                        period=options["period"],
+                        archive=options["archive_compacted"],
+                        directory=options["archive_dir"],
+                        chunk_size=options["chunk_size"],
+                        dry_run=options["dry_run"],
+                    )
+                )
+                self.stdout.write(
+                    f"{verb} {results[-1].rows} compacted companies snapshot(s)"
+                    + (f" -> {results[-1].archive_path}" if results[-1].archive_path else "")
+                )
+
+            if options["archive_after_days"] > 0:
+                cutoff = now - timedelta(days=options["archive_after_days"])
+                for dataset in options["datasets"]:
+                    results.append(
+                        archive_rows(
+                            dataset,
+                            cutoff,
+                            directory=options["archive_dir"],
+                            chunk_size=options["chunk_size"],
+                            dry_run=options["dry_run"],
+                        )
+                    )
+                    self.stdout.write(
+                        f"{verb} {results[-1].rows} archived {dataset} row(s)"
+                        + (f" -> {results[-1].archive_path}" if results[-1].archive_path else "")
+                    )
+        except LifecycleError as exc:
+            raise CommandError(str(exc)) from exc
+
+        total = sum(result.rows for result in results)
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} row(s) in total."))
@@ -0,0 +1,88 @@
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from esg.services.analytics import AnalyticsDelta
+from esg.services.schema_registry import get_registry
+from esg.services.zip_ingestion import (
+    IngestionResult,
+    _ingest_tabular_files,
+    _read_header,
+    _read_table,
+)
+
+
+class Command(BaseCommand):
+    help = "Compare CSV, Parquet and Feather ingestion speed on synthetic CompanyESG data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200_000)
+        parser.add_argument("--extra-columns", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--ingest",
+            action="store_true",
+            help="Also time full ingestion into the database (rolled back afterwards).",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {
+                "company": [f"Company {i % 5000}" for i in range(rows)],
+                "sentiment_score": rng.uniform(-1, 1, rows),
+                "environmental_score": rng.uniform(0, 100, rows),
+                "social_score": rng.uniform(0, 100, rows),
+                "governance_score": rng.uniform(0, 100, rows),
+                "esg_score": rng.uniform(0, 100, rows),
+            }
+        )
+        # Unused vendor columns that columnar projection can skip.
+        for i in range(options["extra_columns"]):
+            df[f"vendor_field_{i}"] = rng.uniform(0, 1, rows)
+
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            writers = {
+                "csv": lambda path: df.to_csv(path, index=False),
+                "parquet": lambda path: df.to_parquet(path, index=False),
+                "feather": lambda path: df.to_feather(path),
+            }
+            self.stdout.write(f"{rows} rows, {len(df.columns)} columns")
+            for fmt, write in writers.items():
+                fmt_dir = root / fmt
+                fmt_dir.mkdir()
+                path = fmt_dir / f"companies.{fmt}"
+                write(path)
+
+                mapping = get_registry().match(_read_header(path))
+                best_read = min(
+                    self._time(lambda: _read_table(path, mapping)) for _ in range(options["repeat"])
+                )
+                line = (
+                    f"{fmt:>8}: {path.stat().st_size / 1e6:8.1f} MB  "
+                    f"read {best_read:6.3f}s ({rows / best_read:,.0f} rows/s)"
+                )
+                if options["ingest"]:
+                    line += f"  ingest {self._time_ingest(fmt_dir):6.3f}s"
+                self.stdout.write(line)
+
+    @staticmethod
+    def _time(fn) -> float:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    def _time_ingest(self, root: Path) -> float:
+        with transaction.atomic():
+            elapsed = self._time(
+                lambda: _ingest_tabular_files(root, AnalyticsDelta(), IngestionResult(), get_registry())
+            )
+            transaction.set_rollback(True)
+        return elapsed
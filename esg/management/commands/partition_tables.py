@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from esg.services.partitioning import (
+    INTERVALS,
+    PARTITIONED_MODELS,
+    PartitioningError,
+    partition_table,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "PostgreSQL only: partition the append-only ESG tables by created_at, or create "
+        "upcoming partitions for tables that are already partitioned. Safe to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "datasets",
+            nargs="*",
+            help=f"Any of: {', '.join(PARTITIONED_MODELS)} (default: all).",
+        )
+        parser.add_argument(
+            "--interval",
+            choices=INTERVALS,
+            default="year",
+            help="Partition size for newly converted tables.",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=2,
+            help="Create partitions for this many future periods.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Print the SQL instead of running it.")
+
+    def handle(self, *args, **options):
+        for dataset in options["datasets"] or list(PARTITIONED_MODELS):
+            try:
+                statements = partition_table(
+                    dataset,
+                    interval=options["interval"],
+                    ahead=options["ahead"],
+                    dry_run=options["dry_run"],
+                )
+            except PartitioningError as exc:
+                raise CommandError(str(exc)) from exc
+
+            if options["dry_run"]:
+                for statement in statements:
+                    self.stdout.write(f"{statement};")
+            self.stdout.write(
+                self.style.SUCCESS(f"{dataset}: {len(statements)} statement(s)")
+            )
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from esg.services.startup_profile import check_budget, profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile worker startup with `python -X importtime`: boot time, peak RSS and "
+        "import time per package. With --check, fail if ESG_STARTUP_BUDGET is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3, help="Fresh boots to take the median of.")
+        parser.add_argument("--top", type=int, default=15, help="Packages to list.")
+        parser.add_argument("--check", action="store_true", help="Exit non-zero when over budget.")
+        parser.add_argument("--boot-ms", type=int, default=None, help="Override the boot time budget.")
+        parser.add_argument("--rss-mb", type=int, default=None, help="Override the peak RSS budget.")
+        parser.add_argument("--json", action="store_true", help="Print the profile as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            profile = profile_startup(repeat=options["repeat"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["json"]:
+            self.stdout.write(json.dumps(profile.to_dict(), indent=2))
+        else:
+            rss = f"{profile.peak_rss_mb:.1f} MB" if profile.peak_rss_mb is not None else "n/a"
+            self.stdout.write(
+                f"Boot {profile.boot_seconds * 1000:.0f} ms, imports {profile.import_ms:.0f} ms, "
+                f"peak RSS {rss}"
+            )
+            for name, ms in list(profile.by_package().items())[: options["top"]]:
+                self.stdout.write(f"  {ms:8.1f} ms  {name}")
+            heavy = ", ".join(profile.heavy_modules) or "none"
+            self.stdout.write(f"Heavy modules loaded: {heavy}")
+
+        if options["check"]:
+            overrides = {
+                key: options[option]
+                for key, option in (("boot_ms", "boot_ms"), ("rss_mb", "rss_mb"))
+                if options[option] is not None
+            }
+            violations = check_budget(profile, overrides)
+            if violations:
+                raise CommandError("Startup budget exceeded: " + "; ".join(violations))
+            self.stdout.write(self.style.SUCCESS("Startup is within budget."))
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from esg.services.chunked_upload import purge_stale_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete unfinished or stuck chunked uploads and their staged files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-hours", type=int, default=24)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["older_than_hours"])
+        count = purge_stale_sessions(cutoff)
+        self.stdout.write(self.style.SUCCESS(f"Purged {count} stale upload(s)."))
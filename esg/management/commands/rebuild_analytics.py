@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from esg.services.analytics import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the analytics summary tables from CompanyESG and ESGNews."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rebuild_summaries(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS("Analytics summaries rebuilt."))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from esg.services.rescoring import RescoreError, rescore_company_esg
+
+
+class Command(BaseCommand):
+    help = (
+        "Score historical CompanyESG rows with the current ESG model, storing results "
+        "per model version. Resumes from the last checkpoint unless --restart is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Predict chunks across this many processes.",
+        )
+        parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint.")
+
+    def handle(self, *args, **options):
+        def report(checkpoint):
+            self.stdout.write(
+                f"{checkpoint.rows_scored} rows scored "
+                f"(last id {checkpoint.last_record_id}, {checkpoint.rows_per_second:,.0f} rows/s)"
+            )
+
+        try:
+            checkpoint = rescore_company_esg(
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+                restart=options["restart"],
+                progress=report,
+            )
+        except RescoreError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Model {checkpoint.model_version}: {checkpoint.rows_scored} rows scored "
+                f"at {checkpoint.rows_per_second:,.0f} rows/s."
+            )
+        )
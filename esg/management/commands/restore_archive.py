@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from esg.services.lifecycle import LifecycleError, restore_archive
+
+
+class Command(BaseCommand):
+    help = "Restore rows from archive files written by apply_retention. Existing rows are skipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Archive files (*.jsonl.gz).")
+        parser.add_argument("--chunk-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        for path in options["paths"]:
+            try:
+                result = restore_archive(path, chunk_size=options["chunk_size"])
+            except (LifecycleError, OSError) as exc:
+                raise CommandError(f"{path}: {exc}") from exc
+            self.stdout.write(
+                self.style.SUCCESS(f"Restored {result.rows} {result.dataset} row(s) from {path}.")
+            )
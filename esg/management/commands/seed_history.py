@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from esg.models import CompanyESG, CompanyReport, ESGNews
+from esg.services.analytics import rebuild_summaries
+from esg.services.lifecycle import bulk_create_with_timestamps
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert synthetic multi-year CompanyESG, ESGNews and CompanyReport history, for "
+        "exercising partitioning, retention and archival against a local database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--years", type=int, default=5)
+        parser.add_argument("--companies", type=int, default=200)
+        parser.add_argument(
+            "--snapshots-per-week",
+            type=int,
+            default=3,
+            help="CompanyESG rows per company per week.",
+        )
+        parser.add_argument("--news-per-day", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        now = timezone.now()
+        start = now - timedelta(days=365 * options["years"])
+        span = (now - start).total_seconds()
+        batch_size = options["batch_size"]
+
+        def timestamps(count):
+            return [start + timedelta(seconds=float(s)) for s in np.sort(rng.uniform(0, span, count))]
+
+        weeks = options["years"] * 52
+        company_rows = options["companies"] * weeks * options["snapshots_per_week"]
+        news_rows = options["years"] * 365 * options["news_per_day"]
+
+        for offset in range(0, company_rows, batch_size):
+            count = min(batch_size, company_rows - offset)
+            env, soc, gov = rng.uniform(0, 100, (3, count))
+            bulk_create_with_timestamps(
+                CompanyESG,
+                (
+                    CompanyESG(
+                        company=f"Company {company}",
+                        sentiment_score=float(sentiment),
+                        environmental_score=float(e),
+                        social_score=float(s),
+                        governance_score=float(g),
+                        esg_score=float((e + s + g) / 3),
+                        created_at=created_at,
+                    )
+                    for company, sentiment, e, s, g, created_at in zip(
+                        rng.integers(0, options["companies"], count),
+                        rng.uniform(-1, 1, count),
+                        env,
+                        soc,
+                        gov,
+                        timestamps(count),
+                    )
+                ),
+            )
+            self.stdout.write(f"{offset + count}/{company_rows} companies rows")
+
+        for offset in range(0, news_rows, batch_size):
+            count = min(batch_size, news_rows - offset)
+            scores = rng.uniform(-1, 1, count)
+            bulk_create_with_timestamps(
+                ESGNews,
+                (
+                    ESGNews(
+                        title=f"Synthetic ESG headline {offset + i}",
+                        summary="Generated by seed_history.",
+                        sentiment_score=float(score),
+                        sentiment_label=(
+                            "positive" if score > 0.3 else "negative" if score < -0.3 else "neutral"
+                        ),
+                        created_at=created_at,
+                    )
+                    for i, (score, created_at) in enumerate(zip(scores, timestamps(count)))
+                ),
+            )
+            self.stdout.write(f"{offset + count}/{news_rows} news rows")
+
+        bulk_create_with_timestamps(
+            CompanyReport,
+            (
+                CompanyReport(
+                    company=f"Company {company}",
+                    report={"year": year, "synthetic": True},
+                    created_at=start + timedelta(days=365 * year),
+                )
+                for company in range(options["companies"])
+                for year in range(options["years"])
+            ),
+        )
+
+        self.stdout.write("Rebuilding analytics summaries...")
+        rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS("Synthetic history created."))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyScoreSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('sentiment_sum', models.FloatField(default=0.0)),
+                ('environmental_sum', models.FloatField(default=0.0)),
+                ('social_sum', models.FloatField(default=0.0)),
+                ('governance_sum', models.FloatField(default=0.0)),
+                ('esg_sum', models.FloatField(default=0.0)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NewsSentimentSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sentiment_label', models.CharField(max_length=50, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('sentiment_sum', models.FloatField(default=0.0)),
+            ],
+            options={
+                'ordering': ['-count'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyLatestScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company', models.CharField(max_length=255, unique=True)),
+                ('sentiment_score', models.FloatField()),
+                ('environmental_score', models.FloatField()),
+                ('social_score', models.FloatField()),
+                ('governance_score', models.FloatField()),
+                ('esg_score', models.FloatField(db_index=True)),
+                ('updated_at', models.DateTimeField()),
+                ('record', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='esg.companyesg')),
+            ],
+            options={
+                'ordering': ['-esg_score'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0002_analytics_summaries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyesg',
+            index=models.Index(fields=['company', 'created_at'], name='esg_company_created_idx'),
+        ),
+    ]
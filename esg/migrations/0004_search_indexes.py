@@ -0,0 +1,115 @@
+from django.db import migrations
+
+
+# PostgreSQL: a stored tsvector column over news title/summary with a GIN
+# index, plus a trigram GIN index on company names for fuzzy lookups.
+POSTGRES_FORWARDS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE esg_esgnews ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX esg_news_search_idx ON esg_esgnews USING gin (search_vector)",
+    """
+    CREATE INDEX esg_latest_company_trgm_idx
+    ON esg_companylatestscore USING gin (company gin_trgm_ops)
+    """,
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX IF EXISTS esg_latest_company_trgm_idx",
+    "DROP INDEX IF EXISTS esg_news_search_idx",
+    "ALTER TABLE esg_esgnews DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: external-content FTS5 tables kept in sync by triggers, so rows
+# written by bulk_create during ingestion are indexed immediately.
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE esg_esgnews_fts USING fts5(
+        title, summary, content='esg_esgnews', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER esg_esgnews_fts_ai AFTER INSERT ON esg_esgnews BEGIN
+        INSERT INTO esg_esgnews_fts(rowid, title, summary)
+        VALUES (new.id, new.title, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER esg_esgnews_fts_ad AFTER DELETE ON esg_esgnews BEGIN
+        INSERT INTO esg_esgnews_fts(esg_esgnews_fts, rowid, title, summary)
+        VALUES ('delete', old.id, old.title, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER esg_esgnews_fts_au AFTER UPDATE ON esg_esgnews BEGIN
+        INSERT INTO esg_esgnews_fts(esg_esgnews_fts, rowid, title, summary)
+        VALUES ('delete', old.id, old.title, old.summary);
+        INSERT INTO esg_esgnews_fts(rowid, title, summary)
+        VALUES (new.id, new.title, new.summary);
+    END
+    """,
+    "INSERT INTO esg_esgnews_fts(esg_esgnews_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE esg_company_fts USING fts5(
+        company, content='esg_companylatestscore', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER esg_company_fts_ai AFTER INSERT ON esg_companylatestscore BEGIN
+        INSERT INTO esg_company_fts(rowid, company) VALUES (new.id, new.company);
+    END
+    """,
+    """
+    CREATE TRIGGER esg_company_fts_ad AFTER DELETE ON esg_companylatestscore BEGIN
+        INSERT INTO esg_company_fts(esg_company_fts, rowid, company)
+        VALUES ('delete', old.id, old.company);
+    END
+    """,
+    """
+    CREATE TRIGGER esg_company_fts_au AFTER UPDATE ON esg_companylatestscore BEGIN
+        INSERT INTO esg_company_fts(esg_company_fts, rowid, company)
+        VALUES ('delete', old.id, old.company);
+        INSERT INTO esg_company_fts(rowid, company) VALUES (new.id, new.company);
+    END
+    """,
+    "INSERT INTO esg_company_fts(esg_company_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS esg_company_fts_au",
+    "DROP TRIGGER IF EXISTS esg_company_fts_ad",
+    "DROP TRIGGER IF EXISTS esg_company_fts_ai",
+    "DROP TABLE IF EXISTS esg_company_fts",
+    "DROP TRIGGER IF EXISTS esg_esgnews_fts_au",
+    "DROP TRIGGER IF EXISTS esg_esgnews_fts_ad",
+    "DROP TRIGGER IF EXISTS esg_esgnews_fts_ai",
+    "DROP TABLE IF EXISTS esg_esgnews_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("esg", "0003_company_created_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARDS, "sqlite": SQLITE_FORWARDS}),
+            _run({"postgresql": POSTGRES_BACKWARDS, "sqlite": SQLITE_BACKWARDS}),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0005_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchemaMapping',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('target', models.CharField(choices=[('company_esg', 'Company ESG scores'), ('news', 'ESG news')], max_length=20)),
+                ('columns', models.JSONField()),
+                ('required', models.JSONField(default=list)),
+                ('dtypes', models.JSONField(blank=True, default=dict)),
+                ('priority', models.IntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-priority', 'name'],
+            },
+        ),
+    ]
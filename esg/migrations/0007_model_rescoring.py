@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0006_schema_mappings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RescoreCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_version', models.CharField(max_length=64, unique=True)),
+                ('last_record_id', models.BigIntegerField(default=0)),
+                ('rows_scored', models.BigIntegerField(default=0)),
+                ('elapsed_seconds', models.FloatField(default=0.0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyESGModelScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_version', models.CharField(max_length=64)),
+                ('predicted_esg_score', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='model_scores', to='esg.companyesg')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['model_version', 'record'], name='esg_model_score_version_idx')],
+                'constraints': [models.UniqueConstraint(fields=('record', 'model_version'), name='esg_unique_record_model_score')],
+            },
+        ),
+    ]
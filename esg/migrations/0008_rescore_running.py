@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0007_model_rescoring'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rescorecheckpoint',
+            name='running',
+            field=models.BooleanField(default=False),
+        ),
+    ]
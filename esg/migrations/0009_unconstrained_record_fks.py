@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# On SQLite, AlterField rebuilds esg_companylatestscore, which drops the FTS
+# triggers created in 0004; recreate them and resync the index.
+SQLITE_COMPANY_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS esg_company_fts_ai AFTER INSERT ON esg_companylatestscore BEGIN
+        INSERT INTO esg_company_fts(rowid, company) VALUES (new.id, new.company);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS esg_company_fts_ad AFTER DELETE ON esg_companylatestscore BEGIN
+        INSERT INTO esg_company_fts(esg_company_fts, rowid, company)
+        VALUES ('delete', old.id, old.company);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS esg_company_fts_au AFTER UPDATE ON esg_companylatestscore BEGIN
+        INSERT INTO esg_company_fts(esg_company_fts, rowid, company)
+        VALUES ('delete', old.id, old.company);
+        INSERT INTO esg_company_fts(rowid, company) VALUES (new.id, new.company);
+    END
+    """,
+    "INSERT INTO esg_company_fts(esg_company_fts) VALUES ('rebuild')",
+]
+
+
+def restore_company_fts_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_COMPANY_FTS_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0008_rescore_running'),
+    ]
+
+    # Rebuilding the table drops the triggers in both directions, so they are
+    # restored after the AlterFields either way.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_company_fts_triggers),
+        migrations.AlterField(
+            model_name='companyesgmodelscore',
+            name='record',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='model_scores', to='esg.companyesg'),
+        ),
+        migrations.AlterField(
+            model_name='companylatestscore',
+            name='record',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='esg.companyesg'),
+        ),
+        migrations.RunPython(restore_company_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('esg', '0009_unconstrained_record_fks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rescorecheckpoint',
+            name='claim_token',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,3 +1,6 @@
+import uuid
+
+from django.core.exceptions import ValidationError
 from django.db import models
 
 
@@ -12,6 +15,9 @@ class CompanyESG(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["company", "created_at"], name="esg_company_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.company} ({self.esg_score})"
@@ -42,3 +48,188 @@ class CompanyReport(models.Model):
     def __str__(self) -> str:
         return f"Report for {self.company}"
 
+
+class CompanyLatestScore(models.Model):
+    """Most recent ESG snapshot per company, maintained during ingestion."""
+
+    company = models.CharField(max_length=255, unique=True)
+    # No database constraint: a partitioned CompanyESG table (see
+    # services.partitioning) has no unique `id` to reference.
+    record = models.ForeignKey(
+        CompanyESG,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    sentiment_score = models.FloatField()
+    environmental_score = models.FloatField()
+    social_score = models.FloatField()
+    governance_score = models.FloatField()
+    esg_score = models.FloatField(db_index=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-esg_score"]
+
+    def __str__(self) -> str:
+        return f"{self.company} latest ({self.esg_score})"
+
+
+class DailyScoreSummary(models.Model):
+    """Running per-day sums of ingested CompanyESG scores."""
+
+    date = models.DateField(unique=True)
+    count = models.PositiveIntegerField(default=0)
+    sentiment_sum = models.FloatField(default=0.0)
+    environmental_sum = models.FloatField(default=0.0)
+    social_sum = models.FloatField(default=0.0)
+    governance_sum = models.FloatField(default=0.0)
+    esg_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ["date"]
+
+    def __str__(self) -> str:
+        return f"Scores on {self.date} ({self.count})"
+
+
+class NewsSentimentSummary(models.Model):
+    """Running per-label counts of ingested ESGNews rows."""
+
+    sentiment_label = models.CharField(max_length=50, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    sentiment_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ["-count"]
+
+    def __str__(self) -> str:
+        return f"{self.sentiment_label or 'unlabelled'} ({self.count})"
+
+
+class UploadSession(models.Model):
+    """A resumable, chunked ZIP upload staged on local disk."""
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_COMPLETE = "complete"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_COMPLETE, "Complete"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    result = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Upload {self.filename} ({self.received_bytes}/{self.total_size})"
+
+
+class SchemaMapping(models.Model):
+    """
+    A configurable mapping from vendor file headers to an ingestion target.
+
+    `columns` maps each canonical field (e.g. `esg_score`) to the list of
+    header aliases that may carry it; `required` lists the canonical fields
+    a header must provide for the mapping to apply.
+    """
+
+    TARGET_COMPANY_ESG = "company_esg"
+    TARGET_NEWS = "news"
+    TARGET_CHOICES = [
+        (TARGET_COMPANY_ESG, "Company ESG scores"),
+        (TARGET_NEWS, "ESG news"),
+    ]
+
+    name = models.CharField(max_length=100, unique=True)
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    columns = models.JSONField()
+    required = models.JSONField(default=list)
+    dtypes = models.JSONField(default=dict, blank=True)
+    priority = models.IntegerField(default=0)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-priority", "name"]
+
+    def __str__(self) -> str:
+        return f"{self.name} -> {self.target}"
+
+    def clean(self) -> None:
+        # Imported here: the registry module imports this one.
+        from esg.services.schema_registry import mapping_errors
+
+        errors = mapping_errors(
+            {"target": self.target, "columns": self.columns, "required": self.required, "dtypes": self.dtypes}
+        )
+        if errors:
+            raise ValidationError(errors)
+
+
+class CompanyESGModelScore(models.Model):
+    """An ESG score predicted for a CompanyESG row by a specific model version."""
+
+    # Unconstrained for the same reason as CompanyLatestScore.record.
+    record = models.ForeignKey(
+        CompanyESG,
+        on_delete=models.CASCADE,
+        related_name="model_scores",
+        db_constraint=False,
+    )
+    model_version = models.CharField(max_length=64)
+    predicted_esg_score = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["record", "model_version"], name="esg_unique_record_model_score"
+            ),
+        ]
+        indexes = [models.Index(fields=["model_version", "record"], name="esg_model_score_version_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.record_id} @ {self.model_version} ({self.predicted_esg_score})"
+
+
+class RescoreCheckpoint(models.Model):
+    """Progress of a rescoring run for one model version, used to resume."""
+
+    model_version = models.CharField(max_length=64, unique=True)
+    last_record_id = models.BigIntegerField(default=0)
+    rows_scored = models.BigIntegerField(default=0)
+    elapsed_seconds = models.FloatField(default=0.0)
+    # Claimed by a run under select_for_update(); see services.rescoring.
+    # Progress is only written by the run holding `claim_token`.
+    running = models.BooleanField(default=False)
+    claim_token = models.UUIDField(null=True, blank=True, editable=False)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-updated_at"]
+
+    def __str__(self) -> str:
+        return f"Rescore {self.model_version} ({self.rows_scored} rows)"
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_scored / self.elapsed_seconds if self.elapsed_seconds else 0.0
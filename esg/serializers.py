@@ -1,6 +1,13 @@
 from rest_framework import serializers
 
-from .models import CompanyESG, CompanyReport, ESGNews
+from .models import (
+    CompanyESG,
+    CompanyLatestScore,
+    CompanyReport,
+    ESGNews,
+    RescoreCheckpoint,
+    UploadSession,
+)
 
 
 class CompanyESGSerializer(serializers.ModelSerializer):
@@ -57,3 +64,96 @@ class ESGPredictRequestSerializer(serializers.Serializer):
     social_score = serializers.FloatField()
     governance_score = serializers.FloatField()
 
+
+class ESGExplainBatchRequestSerializer(serializers.Serializer):
+    items = ESGPredictRequestSerializer(many=True, allow_empty=False, max_length=1000)
+
+
+class CompanyHistoryQuerySerializer(serializers.Serializer):
+    points = serializers.IntegerField(required=False, min_value=3, max_value=10_000)
+    method = serializers.ChoiceField(choices=["lttb", "mean"], default="lttb")
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+
+class CompanyLatestScoreSerializer(serializers.ModelSerializer):
+    # Expose the underlying CompanyESG pk so clients can link to detail views.
+    id = serializers.IntegerField(source="record_id", allow_null=True)
+
+    class Meta:
+        model = CompanyLatestScore
+        fields = [
+            "id",
+            "company",
+            "esg_score",
+            "environmental_score",
+            "social_score",
+            "governance_score",
+            "sentiment_score",
+            "updated_at",
+        ]
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200, trim_whitespace=True)
+    page = serializers.IntegerField(required=False, min_value=1, default=1)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20)
+
+
+class ESGNewsSearchResultSerializer(ESGNewsSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(ESGNewsSerializer.Meta):
+        fields = ESGNewsSerializer.Meta.fields + ["rank"]
+
+
+class CompanySearchResultSerializer(CompanyLatestScoreSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(CompanyLatestScoreSerializer.Meta):
+        fields = CompanyLatestScoreSerializer.Meta.fields + ["rank"]
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, allow_blank=True)
+
+    def validate_filename(self, value: str) -> str:
+        if not value.lower().endswith(".zip"):
+            raise serializers.ValidationError("Only ZIP archives are supported.")
+        return value
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    upload_id = serializers.UUIDField(source="id", read_only=True)
+    offset = serializers.IntegerField(source="received_bytes", read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "upload_id",
+            "filename",
+            "total_size",
+            "offset",
+            "status",
+            "result",
+            "created_at",
+        ]
+
+
+class RescoreCheckpointSerializer(serializers.ModelSerializer):
+    rows_per_second = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RescoreCheckpoint
+        fields = [
+            "model_version",
+            "last_record_id",
+            "rows_scored",
+            "rows_per_second",
+            "running",
+            "started_at",
+            "updated_at",
+            "completed_at",
+        ]
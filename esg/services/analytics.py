@@ -0,0 +1,194 @@
+"""
+Incrementally maintained summary tables backing the analytics endpoints.
+
+Ingestion records the rows it creates in an `AnalyticsDelta` and applies it
+at the end of the same transaction, so the dashboard never has to scan the
+append-only CompanyESG / ESGNews tables.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Sum
+
+from esg.models import (
+    CompanyESG,
+    CompanyLatestScore,
+    DailyScoreSummary,
+    ESGNews,
+    NewsSentimentSummary,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+_DAILY_FIELDS = {
+    "sentiment_sum": "sentiment_score",
+    "environmental_sum": "environmental_score",
+    "social_sum": "social_score",
+    "governance_sum": "governance_score",
+    "esg_sum": "esg_score",
+}
+
+_LATEST_FIELDS = (
+    "sentiment_score",
+    "environmental_score",
+    "social_score",
+    "governance_score",
+    "esg_score",
+)
+
+
+def _float_totals() -> Dict[str, float]:
+    return defaultdict(float)
+
+
+@dataclass
+class AnalyticsDelta:
+    """
+    Summary updates pending for rows created during a single ingestion.
+
+    Rows are folded into per-day sums, the latest snapshot per company and
+    per-label counts as they are added, so the delta stays as small as the
+    number of distinct days, companies and labels however many rows an
+    upload contains.
+    """
+
+    company_rows: int = 0
+    news_rows: int = 0
+    latest: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    daily: Dict[date, Dict[str, float]] = field(default_factory=lambda: defaultdict(_float_totals))
+    sentiment: Dict[str, Dict[str, float]] = field(default_factory=lambda: defaultdict(_float_totals))
+
+    def add_companies(self, instances: Iterable[CompanyESG]) -> None:
+        for instance in instances:
+            self.company_rows += 1
+            # Later rows win: they were created after earlier ones.
+            self.latest[instance.company] = {
+                "record_id": instance.pk,
+                "updated_at": instance.created_at,
+                **{name: getattr(instance, name) for name in _LATEST_FIELDS},
+            }
+            bucket = self.daily[instance.created_at.date()]
+            bucket["count"] += 1
+            for sum_field, score_field in _DAILY_FIELDS.items():
+                bucket[sum_field] += getattr(instance, score_field)
+
+    def add_news(self, instances: Iterable[ESGNews]) -> None:
+        for instance in instances:
+            self.news_rows += 1
+            bucket = self.sentiment[instance.sentiment_label]
+            bucket["count"] += 1
+            bucket["sentiment_sum"] += instance.sentiment_score
+
+    def apply(self) -> None:
+        """Fold the recorded rows into the summary tables."""
+        if self.latest:
+            _update_latest_scores(self.latest)
+        if self.daily:
+            _update_daily_summaries(self.daily)
+        if self.sentiment:
+            _update_sentiment_summaries(self.sentiment)
+
+
+def _update_latest_scores(latest: Dict[str, Dict[str, object]]) -> None:
+    rows = [CompanyLatestScore(company=company, **values) for company, values in latest.items()]
+    CompanyLatestScore.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["company"],
+        update_fields=["record", *_LATEST_FIELDS, "updated_at"],
+    )
+
+
+def _update_daily_summaries(totals: Dict[date, Dict[str, float]]) -> None:
+    DailyScoreSummary.objects.bulk_create(
+        [DailyScoreSummary(date=day) for day in totals],
+        ignore_conflicts=True,
+    )
+    for day, bucket in totals.items():
+        DailyScoreSummary.objects.filter(date=day).update(
+            count=F("count") + int(bucket["count"]),
+            **{name: F(name) + bucket[name] for name in _DAILY_FIELDS},
+        )
+
+
+def _update_sentiment_summaries(totals: Dict[str, Dict[str, float]]) -> None:
+    NewsSentimentSummary.objects.bulk_create(
+        [NewsSentimentSummary(sentiment_label=label) for label in totals],
+        ignore_conflicts=True,
+    )
+    for label, bucket in totals.items():
+        NewsSentimentSummary.objects.filter(sentiment_label=label).update(
+            count=F("count") + int(bucket["count"]),
+            sentiment_sum=F("sentiment_sum") + bucket["sentiment_sum"],
+        )
+
+
+def rebuild_summaries(chunk_size: int = 5000) -> None:
+    """Recompute every summary table from the raw tables (full scan)."""
+    with transaction.atomic():
+        CompanyLatestScore.objects.all().delete()
+        DailyScoreSummary.objects.all().delete()
+        NewsSentimentSummary.objects.all().delete()
+
+        delta = AnalyticsDelta()
+        delta.add_companies(CompanyESG.objects.order_by("created_at", "id").iterator(chunk_size=chunk_size))
+        delta.add_news(ESGNews.objects.iterator(chunk_size=chunk_size))
+        delta.apply()
+
+    logger.info(
+        "Rebuilt analytics summaries from %s company rows and %s news rows",
+        delta.company_rows,
+        delta.news_rows,
+    )
+
+
+def overview() -> Dict[str, object]:
+    """Overall averages across the latest snapshot of every company."""
+    stats = CompanyLatestScore.objects.aggregate(
+        companies=Count("id"),
+        esg_score=Avg("esg_score"),
+        environmental_score=Avg("environmental_score"),
+        social_score=Avg("social_score"),
+        governance_score=Avg("governance_score"),
+        sentiment_score=Avg("sentiment_score"),
+    )
+    news = NewsSentimentSummary.objects.aggregate(total=Sum("count"))
+    stats["news"] = news["total"] or 0
+    return stats
+
+
+def ranked_companies(limit: int, ascending: bool = False):
+    """Return the top (or bottom) `limit` companies by latest ESG score."""
+    order = "esg_score" if ascending else "-esg_score"
+    return CompanyLatestScore.objects.order_by(order, "company")[:limit]
+
+
+def sentiment_histogram() -> List[Dict[str, object]]:
+    """Return news counts and mean sentiment per label."""
+    return [
+        {
+            "sentiment_label": row.sentiment_label,
+            "count": row.count,
+            "average_sentiment": row.sentiment_sum / row.count if row.count else 0.0,
+        }
+        for row in NewsSentimentSummary.objects.all()
+    ]
+
+
+def daily_trends(since: date) -> List[Dict[str, object]]:
+    """Return per-day average scores of ingested rows from `since` onwards."""
+    trends = []
+    for row in DailyScoreSummary.objects.filter(date__gte=since):
+        entry: Dict[str, object] = {"date": row.date, "count": row.count}
+        for sum_field, score_field in _DAILY_FIELDS.items():
+            total = getattr(row, sum_field)
+            entry[score_field] = total / row.count if row.count else 0.0
+        trends.append(entry)
+    return trends
@@ -0,0 +1,219 @@
+"""
+Resumable chunked ZIP uploads.
+
+Protocol:
+1. `create_session` registers the upload and creates an empty staging file.
+2. `write_chunk` appends one chunk at the session's current offset, streaming
+   the request body straight to disk and verifying its SHA-256. The offset is
+   only committed once the whole chunk is on disk.
+3. `finalize_session` checks the assembled file and ingests it in place.
+
+Chunks are never buffered whole in memory, so worker memory stays flat no
+matter how large the archive is.
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from esg.models import UploadSession
+from esg.services.zip_ingestion import IngestionError, IngestionResult, ingest_zip_path
+
+
+logger = logging.getLogger(__name__)
+
+
+_COPY_BUFFER_SIZE = 64 * 1024
+
+
+class UploadSessionError(Exception):
+    """Raised when a chunked upload request cannot be applied."""
+
+
+class OffsetMismatchError(UploadSessionError):
+    """Raised when a chunk does not start at the session's current offset."""
+
+    def __init__(self, expected: int) -> None:
+        super().__init__(f"Chunk must start at offset {expected}.")
+        self.expected = expected
+
+
+def staging_dir() -> Path:
+    path = Path(settings.ESG_UPLOAD_STAGING_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def staging_path(session: UploadSession) -> Path:
+    return staging_dir() / f"{session.pk}.part"
+
+
+def create_session(filename: str, total_size: int, checksum: str = "") -> UploadSession:
+    """Register a new upload of `total_size` bytes."""
+    if total_size <= 0:
+        raise UploadSessionError("Upload size must be positive.")
+    if total_size > settings.ESG_UPLOAD_MAX_SIZE:
+        raise UploadSessionError("Upload exceeds the maximum allowed size.")
+
+    session = UploadSession.objects.create(
+        filename=filename,
+        total_size=total_size,
+        checksum=checksum.lower(),
+    )
+    staging_path(session).touch()
+    return session
+
+
+def _discard_tail(path: Path, session_id, offset: int) -> None:
+    """
+    Truncate bytes this request wrote past `offset` that no committed chunk
+    covers. Another request may have committed this offset meanwhile, so the
+    file is never cut below the session's current `received_bytes`.
+    """
+    committed = (
+        UploadSession.objects.filter(pk=session_id).values_list("received_bytes", flat=True).first()
+    )
+    if committed is None:
+        return
+    keep = max(offset, committed)
+    try:
+        with path.open("r+b") as f:
+            if os.fstat(f.fileno()).st_size > keep:
+                f.truncate(keep)
+    except OSError:
+        logger.warning("Failed to truncate staged upload %s", path)
+
+
+def write_chunk(
+    session_id,
+    offset: int,
+    stream: IO[bytes],
+    length: int,
+    checksum: Optional[str] = None,
+) -> UploadSession:
+    """
+    Append `length` bytes read from `stream` at `offset`.
+
+    The body is streamed to disk outside any transaction, so a slow client
+    never holds a database connection or row lock. The new offset is then
+    committed with a compare-and-set on `received_bytes`; if another request
+    got there first, this chunk is discarded and `OffsetMismatchError`
+    reports the current offset.
+
+    If `checksum` (hex SHA-256 of the chunk) does not match, the staged file
+    is truncated back to `offset` and the chunk must be resent.
+    """
+    session = UploadSession.objects.get(pk=session_id)
+
+    if session.status != UploadSession.STATUS_PENDING:
+        raise UploadSessionError("Upload is no longer accepting chunks.")
+    if offset != session.received_bytes:
+        raise OffsetMismatchError(session.received_bytes)
+    if length <= 0 or offset + length > session.total_size:
+        raise UploadSessionError("Chunk length is outside the declared upload size.")
+
+    path = staging_path(session)
+    digest = hashlib.sha256()
+    written = 0
+    with path.open("r+b") as f:
+        f.seek(offset)
+        while written < length:
+            block = stream.read(min(_COPY_BUFFER_SIZE, length - written))
+            if not block:
+                break
+            digest.update(block)
+            f.write(block)
+            written += len(block)
+
+    if written != length or (checksum and digest.hexdigest() != checksum.lower()):
+        _discard_tail(path, session.pk, offset)
+        if written != length:
+            raise UploadSessionError("Chunk body ended before the declared length.")
+        raise UploadSessionError("Chunk checksum mismatch.")
+
+    now = timezone.now()
+    updated = UploadSession.objects.filter(
+        pk=session.pk, received_bytes=offset, status=UploadSession.STATUS_PENDING
+    ).update(received_bytes=offset + written, updated_at=now)
+    if not updated:
+        _discard_tail(path, session.pk, offset)
+        current = UploadSession.objects.filter(pk=session.pk).first()
+        if current is None or current.status != UploadSession.STATUS_PENDING:
+            raise UploadSessionError("Upload is no longer accepting chunks.")
+        raise OffsetMismatchError(current.received_bytes)
+
+    session.received_bytes = offset + written
+    session.updated_at = now
+    return session
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_session(session_id) -> IngestionResult:
+    """Ingest a fully received upload and remove its staging file."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.status != UploadSession.STATUS_PENDING:
+            raise UploadSessionError("Upload has already been finalised.")
+        if session.received_bytes != session.total_size:
+            raise UploadSessionError(
+                f"Upload incomplete: {session.received_bytes} of {session.total_size} bytes received."
+            )
+        # Claim the session so a concurrent finalise cannot ingest it twice.
+        session.status = UploadSession.STATUS_PROCESSING
+        session.save(update_fields=["status", "updated_at"])
+
+    path = staging_path(session)
+    try:
+        if path.stat().st_size != session.total_size:
+            raise IngestionError("Staged upload size does not match the declared size.")
+        if session.checksum and _file_sha256(path) != session.checksum:
+            raise IngestionError("Upload checksum mismatch.")
+        result = ingest_zip_path(path)
+    except Exception:
+        session.status = UploadSession.STATUS_FAILED
+        session.save(update_fields=["status", "updated_at"])
+        raise
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            logger.warning("Failed to delete staged upload %s", path)
+
+    session.status = UploadSession.STATUS_COMPLETE
+    session.result = result.to_dict()
+    session.save(update_fields=["status", "result", "updated_at"])
+    return result
+
+
+def purge_stale_sessions(older_than) -> int:
+    """
+    Delete unfinished sessions last touched before `older_than`. This
+    includes sessions stuck in `processing`, e.g. because the worker running
+    `finalize_session` was killed.
+    """
+    stale = UploadSession.objects.filter(
+        status__in=[UploadSession.STATUS_PENDING, UploadSession.STATUS_PROCESSING],
+        updated_at__lt=older_than,
+    )
+    count = 0
+    for session in stale.iterator():
+        try:
+            os.remove(staging_path(session))
+        except OSError:
+            pass
+        session.delete()
+        count += 1
+    return count
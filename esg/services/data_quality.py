@@ -0,0 +1,317 @@
+"""
+Declarative data quality rules applied to tabular files during ingestion.
+
+Rules are plain dicts, like schema mappings, keyed by ingestion target:
+
+    {"rule": "required", "field": "company"}
+    {"rule": "range", "field": "esg_score", "min": 0, "max": 100}
+    {"rule": "duplicate", "fields": ["title", "summary"]}
+    {"rule": "outlier", "field": "esg_score", "by": "company", "threshold": 3.5}
+
+Every rule evaluates to one boolean mask over the file's frame, so validating a
+million rows costs a handful of vectorised pandas operations. A rule's
+`action` is either `quarantine` (the default: failing rows are held back and
+written to a CSV under `ESG_QUARANTINE_DIR`) or `flag` (rows are ingested
+and only counted). Rules for a field missing from the file are skipped.
+
+`settings.ESG_DATA_QUALITY` controls the thresholds:
+- `max_invalid_ratio`: a file with a larger share of quarantined rows is
+  rejected as a whole.
+- `fail_upload`: if true, a rejected file aborts the entire upload.
+- `sample_rows`: failing rows included per rule in the report.
+- `rules`: per-target rule lists replacing `DEFAULT_RULES`.
+"""
+
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from esg.models import SchemaMapping
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+ACTION_QUARANTINE = "quarantine"
+ACTION_FLAG = "flag"
+
+_SCORE_FIELDS = ["environmental_score", "social_score", "governance_score", "esg_score"]
+
+DEFAULT_RULES: Dict[str, List[Dict[str, Any]]] = {
+    SchemaMapping.TARGET_COMPANY_ESG: [
+        {"rule": "required", "field": "company"},
+        {"rule": "range", "field": "sentiment_score", "min": -1, "max": 1},
+        *({"rule": "range", "field": name, "min": 0, "max": 100} for name in _SCORE_FIELDS),
+        {
+            "rule": "duplicate",
+            "fields": ["company", "sentiment_score", *_SCORE_FIELDS],
+        },
+        {
+            "rule": "outlier",
+            "field": "esg_score",
+            "by": "company",
+            "threshold": 3.5,
+            "action": ACTION_FLAG,
+        },
+    ],
+    SchemaMapping.TARGET_NEWS: [
+        {"rule": "required", "field": "title"},
+        # Missing sentiment is scored locally during ingestion.
+        {"rule": "range", "field": "sentiment_score", "min": -1, "max": 1, "allow_null": True},
+        {"rule": "duplicate", "fields": ["title", "summary"]},
+    ],
+}
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "max_invalid_ratio": 0.5,
+    "fail_upload": False,
+    "sample_rows": 5,
+    "rules": {},
+}
+
+
+def quality_settings() -> Dict[str, Any]:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "ESG_DATA_QUALITY", {})}
+
+
+class Rule:
+    """Base class: `failing(df, valid)` returns a mask of rows breaking the rule."""
+
+    name = ""
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.action = spec.get("action", ACTION_QUARANTINE)
+        if self.action not in (ACTION_QUARANTINE, ACTION_FLAG):
+            raise ValueError(f"Unknown data quality action '{self.action}'.")
+        self.fields: List[str] = list(spec.get("fields") or [spec["field"]])
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}:{','.join(self.fields)}"
+
+    def applies_to(self, df: "pd.DataFrame") -> bool:
+        return all(name in df.columns for name in self.fields)
+
+    def failing(self, df: "pd.DataFrame", valid: "pd.Series") -> "pd.Series":
+        raise NotImplementedError
+
+
+class RequiredRule(Rule):
+    """The field must be a non-empty string."""
+
+    name = "required"
+
+    def failing(self, df, valid):
+        values = df[self.fields[0]]
+        return values.isna() | values.astype(str).str.strip().eq("")
+
+
+class RangeRule(Rule):
+    """The field must be numeric and within [min, max]."""
+
+    name = "range"
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        super().__init__(spec)
+        self.minimum = spec.get("min", -math.inf)
+        self.maximum = spec.get("max", math.inf)
+        self.allow_null = bool(spec.get("allow_null", False))
+
+    def failing(self, df, valid):
+        import pandas as pd
+
+        raw = df[self.fields[0]]
+        values = pd.to_numeric(raw, errors="coerce")
+        in_range = values.between(self.minimum, self.maximum)
+        if self.allow_null:
+            in_range |= raw.isna()
+        return ~in_range
+
+
+class DuplicateRule(Rule):
+    """Rows repeating an earlier valid row of the same file on `fields`."""
+
+    name = "duplicate"
+
+    def applies_to(self, df):
+        # Compare on whichever of the fields the file provides.
+        self.present = [name for name in self.fields if name in df.columns]
+        return bool(self.present)
+
+    def failing(self, df, valid):
+        duplicated = df.loc[valid, self.present].duplicated(keep="first")
+        return duplicated.reindex(df.index, fill_value=False)
+
+
+class OutlierRule(Rule):
+    """
+    Values far from their group's median, measured as a robust z-score
+    (0.6745 * |x - median| / MAD). Groups smaller than `min_group` rows are
+    not judged.
+    """
+
+    name = "outlier"
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        super().__init__(spec)
+        self.by = spec.get("by", "company")
+        self.threshold = float(spec.get("threshold", 3.5))
+        self.min_group = int(spec.get("min_group", 5))
+
+    def applies_to(self, df):
+        return super().applies_to(df) and self.by in df.columns
+
+    def failing(self, df, valid):
+        import pandas as pd
+
+        subset = df.loc[valid]
+        values = pd.to_numeric(subset[self.fields[0]], errors="coerce")
+        groups = subset[self.by]
+        deviation = (values - values.groupby(groups).transform("median")).abs()
+        mad = deviation.groupby(groups).transform("median")
+        size = values.groupby(groups).transform("count")
+        score = 0.6745 * deviation / mad.where(mad > 0)
+        outliers = (size >= self.min_group) & score.gt(self.threshold)
+        return outliers.reindex(df.index, fill_value=False)
+
+
+RULE_TYPES = {
+    rule.name: rule for rule in (RequiredRule, RangeRule, DuplicateRule, OutlierRule)
+}
+
+
+def build_rules(specs: Sequence[Dict[str, Any]]) -> List[Rule]:
+    rules = []
+    for spec in specs:
+        try:
+            rule_type = RULE_TYPES[spec["rule"]]
+        except KeyError:
+            raise ValueError(f"Unknown data quality rule '{spec.get('rule')}'.") from None
+        rules.append(rule_type(spec))
+    return rules
+
+
+def rules_for(target: str) -> List[Rule]:
+    configured = quality_settings()["rules"]
+    return build_rules(configured.get(target, DEFAULT_RULES.get(target, [])))
+
+
+@dataclass
+class QualityReport:
+    """Compact per-file validation summary included in IngestionResult."""
+
+    file: str
+    target: str
+    rows: int = 0
+    quarantined: int = 0
+    flagged: int = 0
+    inserted: int = 0
+    status: str = "ingested"
+    # File name relative to ESG_QUARANTINE_DIR; server paths are not exposed.
+    quarantine_file: Optional[str] = None
+    rules: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def invalid_ratio(self) -> float:
+        return self.quarantined / self.rows if self.rows else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file,
+            "target": self.target,
+            "status": self.status,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "quarantined": self.quarantined,
+            "flagged": self.flagged,
+            "quarantine_file": self.quarantine_file,
+            "rules": self.rules,
+        }
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if hasattr(value, "item"):
+        return _json_safe(value.item())
+    return value
+
+
+def _samples(df: "pd.DataFrame", mask: "pd.Series", columns: List[str], limit: int) -> List[Dict[str, Any]]:
+    rows = df.loc[mask, columns].head(limit)
+    return [
+        # 1-based data row number within the file.
+        {"row": int(position) + 1, "values": {name: _json_safe(value) for name, value in row.items()}}
+        for position, row in zip(rows.index, rows.to_dict("records"))
+    ]
+
+
+def validate(
+    df: "pd.DataFrame",
+    target: str,
+    file: str,
+    rules: Optional[List[Rule]] = None,
+) -> Tuple["pd.Series", "pd.Series", QualityReport]:
+    """
+    Run `target`'s rules over `df` (which must have a default RangeIndex).
+
+    Returns (keep mask, per-row error labels, report). Rows failing any
+    quarantine rule are dropped from the keep mask; their labels name every
+    rule they broke.
+    """
+    import pandas as pd
+
+    config = quality_settings()
+    rules = rules_for(target) if rules is None else rules
+    report = QualityReport(file=file, target=target, rows=len(df))
+
+    keep = pd.Series(True, index=df.index)
+    flagged = pd.Series(False, index=df.index)
+    errors = pd.Series("", index=df.index, dtype=object)
+
+    for rule in rules:
+        if not rule.applies_to(df):
+            continue
+        failing = rule.failing(df, keep).fillna(False).astype(bool)
+        count = int(failing.sum())
+        if not count:
+            continue
+
+        columns = [name for name in ("company", "title") if name in df.columns and name not in rule.fields]
+        columns += [name for name in rule.fields if name in df.columns]
+        report.rules.append(
+            {
+                "rule": rule.name,
+                "fields": rule.fields,
+                "action": rule.action,
+                "failed": count,
+                "samples": _samples(df, failing, columns, config["sample_rows"]),
+            }
+        )
+        errors = errors.where(~failing, errors + rule.label + ";")
+        if rule.action == ACTION_QUARANTINE:
+            keep &= ~failing
+        else:
+            flagged |= failing
+
+    report.quarantined = int((~keep).sum())
+    report.flagged = int((flagged & keep).sum())
+    return keep, errors.str.rstrip(";"), report
+
+
+def write_quarantine(df: "pd.DataFrame", errors: "pd.Series", mask: "pd.Series", file: str) -> Path:
+    """Write the rows in `mask` with their error labels to a CSV for review."""
+    directory = Path(settings.ESG_QUARANTINE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_name = file.replace("/", "__").replace("\\", "__")
+    path = directory / f"{timezone.now():%Y%m%dT%H%M%S%f}-{Path(safe_name).stem}.csv"
+
+    quarantined = df.loc[mask].copy()
+    quarantined.insert(0, "quality_errors", errors[mask])
+    quarantined.insert(0, "row", quarantined.index + 1)
+    quarantined.to_csv(path, index=False)
+    return path
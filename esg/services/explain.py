@@ -0,0 +1,211 @@
+"""
+Per-feature explanations of ESG model predictions.
+
+Three strategies, chosen from the model's shape:
+- `linear`: exact `coef_ * (x - baseline)` for models exposing `coef_`.
+- `tree_path`: Saabas-style decision-path attributions for scikit-learn
+  tree ensembles, vectorised with one sparse product per tree.
+- `shapley`: exact Shapley values for any other model, evaluating all 2^4
+  feature coalitions against the baseline in a single batched `predict`.
+
+`linear` and `shapley` explain against a baseline: the average latest score
+across companies (from the analytics summary tables) when a model version is
+first explained. It is then pinned for that version, so later ingestions do
+not invalidate cached explanations. `tree_path` needs no baseline.
+Explanations are cached per model version and input in the `explanations`
+cache alias.
+"""
+
+from itertools import product
+from math import factorial
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from django.core.cache import caches
+
+from esg.services import analytics
+from esg.services.model_loader import get_esg_model, get_model_version
+from esg.services.rescoring import FEATURE_FIELDS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Baselines pinned per model version, also shared through the cache so that
+# every worker explains a version against the same baseline.
+_baselines: Dict[str, List[float]] = {}
+
+
+class ExplainError(Exception):
+    """Raised when explanations cannot be produced."""
+
+
+def _current_baseline() -> List[float]:
+    stats = analytics.overview()
+    return [float(stats.get(name) or 0.0) for name in FEATURE_FIELDS]
+
+
+def _baseline(version: str) -> "np.ndarray":
+    import numpy as np
+
+    if version not in _baselines:
+        _baselines[version] = caches["explanations"].get_or_set(
+            f"esg-explain-baseline:{version}", _current_baseline, timeout=None
+        )
+    return np.array(_baselines[version], dtype=float)
+
+
+def _tree_scales(model) -> Optional[List[tuple]]:
+    """Return [(tree, scale)] if `model` is a supported tree model, else None."""
+    import numpy as np
+
+    if hasattr(model, "tree_"):
+        return [(model, 1.0)]
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        return None
+    estimators = np.ravel(estimators)
+    if not len(estimators) or not all(hasattr(tree, "tree_") for tree in estimators):
+        return None
+    if hasattr(model, "init_") and hasattr(model, "learning_rate"):
+        # Gradient boosting: prediction = init + learning_rate * sum(trees).
+        return [(tree, float(model.learning_rate)) for tree in estimators]
+    if hasattr(model, "learning_rate"):
+        # Other boosting schemes (e.g. AdaBoost's weighted median) do not
+        # decompose additively over trees.
+        return None
+    # Bagging / random forests average their trees.
+    return [(tree, 1.0 / len(estimators)) for tree in estimators]
+
+
+def _tree_path_contributions(trees: List[tuple], X: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    contributions = np.zeros_like(X, dtype=float)
+    for tree, scale in trees:
+        structure = tree.tree_
+        values = structure.value[:, 0, 0]
+        n_nodes = structure.node_count
+
+        # Parent of every node and the feature its parent split on.
+        parent = np.full(n_nodes, -1)
+        for side in (structure.children_left, structure.children_right):
+            internal = side >= 0
+            parent[side[internal]] = np.nonzero(internal)[0]
+        has_parent = parent >= 0
+
+        # node_delta[node, feature] = value gained by taking that branch.
+        node_delta = np.zeros((n_nodes, X.shape[1]))
+        nodes = np.nonzero(has_parent)[0]
+        node_delta[nodes, structure.feature[parent[nodes]]] = values[nodes] - values[parent[nodes]]
+
+        paths = tree.decision_path(X)
+        contributions += scale * (paths @ node_delta)
+    return contributions
+
+
+def _shapley_contributions(model, X: "np.ndarray", baseline: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    n_samples, n_features = X.shape
+    masks = np.array(list(product([0, 1], repeat=n_features)), dtype=bool)
+
+    # Evaluate every coalition for every sample in one predict call.
+    batch = np.where(masks[None, :, :], X[:, None, :], baseline[None, None, :])
+    outputs = np.asarray(model.predict(batch.reshape(-1, n_features)), dtype=float)
+    outputs = outputs.reshape(n_samples, len(masks))
+
+    index = {tuple(mask): i for i, mask in enumerate(masks)}
+    contributions = np.zeros((n_samples, n_features))
+    for mask in masks:
+        size = int(mask.sum())
+        for feature in np.nonzero(~mask)[0]:
+            weight = factorial(size) * factorial(n_features - size - 1) / factorial(n_features)
+            with_feature = mask.copy()
+            with_feature[feature] = True
+            contributions[:, feature] += weight * (
+                outputs[:, index[tuple(with_feature)]] - outputs[:, index[tuple(mask)]]
+            )
+    return contributions
+
+
+def _method(model) -> str:
+    import numpy as np
+
+    coef = getattr(model, "coef_", None)
+    if coef is not None and np.ravel(coef).shape[0] == len(FEATURE_FIELDS):
+        return "linear"
+    if _tree_scales(model) is not None:
+        return "tree_path"
+    return "shapley"
+
+
+def _explain_uncached(
+    model, method: str, X: "np.ndarray", baseline: Optional["np.ndarray"]
+) -> List[Dict[str, object]]:
+    import numpy as np
+
+    predictions = np.asarray(model.predict(X), dtype=float)
+
+    if method == "linear":
+        contributions = np.ravel(model.coef_)[None, :] * (X - baseline[None, :])
+    elif method == "tree_path":
+        contributions = _tree_path_contributions(_tree_scales(model), X)
+    else:
+        contributions = _shapley_contributions(model, X, baseline)
+
+    # Whatever the method, base_value + sum(contributions) == prediction.
+    base_values = predictions - contributions.sum(axis=1)
+    return [
+        {
+            "predicted_esg_score": float(predictions[i]),
+            "base_value": float(base_values[i]),
+            "contributions": {
+                name: float(contributions[i, j]) for j, name in enumerate(FEATURE_FIELDS)
+            },
+            "method": method,
+        }
+        for i in range(len(X))
+    ]
+
+
+def _cache_key(version: str, baseline: Optional["np.ndarray"], row: Sequence[float]) -> str:
+    # The pinned baseline stays in the key so that explanations computed
+    # against a recomputed baseline (e.g. after cache eviction) never mix.
+    values = ",".join(repr(float(v)) for v in (*(() if baseline is None else baseline), *row))
+    return f"esg-explain:{version}:{values}"
+
+
+def explain(rows: Sequence[Dict[str, float]]) -> List[Dict[str, object]]:
+    """
+    Explain predictions for `rows` (dicts holding the four input features),
+    computing all cache misses in one batched call.
+    """
+    import numpy as np
+
+    model = get_esg_model()
+    version = get_model_version()
+    if model is None or version is None:
+        raise ExplainError("Prediction model is not available.")
+
+    method = _method(model)
+    baseline = None if method == "tree_path" else _baseline(version)
+    X = np.array([[row[name] for name in FEATURE_FIELDS] for row in rows], dtype=float)
+    keys = [_cache_key(version, baseline, x) for x in X]
+
+    cache = caches["explanations"]
+    cached = cache.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        computed = _explain_uncached(model, method, X[missing], baseline)
+        fresh = {keys[i]: explanation for i, explanation in zip(missing, computed)}
+        cache.set_many(fresh, timeout=CACHE_TIMEOUT)
+        cached.update(fresh)
+
+    results = []
+    for key in keys:
+        explanation = dict(cached[key])
+        explanation["model_version"] = version
+        results.append(explanation)
+    return results
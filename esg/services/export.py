@@ -0,0 +1,113 @@
+"""
+Streaming Parquet export of the ESG tables.
+
+Rows are read from the database in chunks and each chunk is written as one
+Parquet row group, so memory use is bounded by `row_group_size` regardless
+of table size. Requires `pyarrow`.
+"""
+
+from typing import Dict, Iterator, List
+
+from esg.models import CompanyESG, ESGNews
+
+
+EXPORT_FIELDS: Dict[str, List[str]] = {
+    "companies": [
+        "id",
+        "company",
+        "sentiment_score",
+        "environmental_score",
+        "social_score",
+        "governance_score",
+        "esg_score",
+        "created_at",
+    ],
+    "news": [
+        "id",
+        "title",
+        "summary",
+        "sentiment_score",
+        "sentiment_label",
+        "created_at",
+    ],
+}
+
+_EXPORT_MODELS = {"companies": CompanyESG, "news": ESGNews}
+
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back to the caller."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _schema(dataset: str):
+    import pyarrow as pa
+
+    types = {
+        "id": pa.int64(),
+        "company": pa.string(),
+        "title": pa.string(),
+        "summary": pa.string(),
+        "sentiment_label": pa.string(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types.get(name, pa.float64())) for name in EXPORT_FIELDS[dataset]])
+
+
+def stream_parquet(dataset: str, row_group_size: int = 50_000) -> Iterator[bytes]:
+    """Yield a Parquet file for `dataset` (`companies` or `news`) piece by piece."""
+    import pyarrow.parquet as pq
+
+    fields = EXPORT_FIELDS[dataset]
+    schema = _schema(dataset)
+    rows = _EXPORT_MODELS[dataset].objects.order_by("id").values_list(*fields)
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        batch: List[tuple] = []
+        for row in rows.iterator(chunk_size=row_group_size):
+            batch.append(row)
+            if len(batch) >= row_group_size:
+                writer.write_table(_to_table(batch, schema))
+                batch = []
+                yield sink.drain()
+        if batch:
+            writer.write_table(_to_table(batch, schema))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _to_table(rows: List[tuple], schema):
+    import pyarrow as pa
+
+    columns = list(zip(*rows))
+    return pa.Table.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema,
+    )
@@ -0,0 +1,287 @@
+"""
+Retention and archival for the append-only ESG tables.
+
+- `compact_company_snapshots` thins CompanyESG rows older than a cutoff down
+  to the latest snapshot per company and period (day/week/month/quarter/year).
+- `archive_rows` moves rows older than a cutoff into a gzip-compressed JSON
+  Lines file under `settings.ESG_ARCHIVE_DIR` and deletes them.
+- `restore_archive` loads such a file back with its original ids and
+  timestamps; rows that are already present are skipped.
+
+Candidate ids are selected first and rows are written and deleted in
+`chunk_size` batches. An archive file is complete on disk before any of its
+rows are deleted. A company's latest snapshot (referenced by
+CompanyLatestScore) is never compacted or archived, and neither is its
+newest CompanyReport, which /api/reports/<company>/ serves.
+
+The analytics summary tables describe everything ever ingested and are left
+as they are; run `rebuild_analytics` to make them reflect live rows only.
+"""
+
+import gzip
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F, Max, OuterRef, Subquery, Window
+from django.db.models.functions import RowNumber, Trunc
+from django.utils import timezone
+
+from esg.models import CompanyESG, CompanyLatestScore, CompanyReport, ESGNews
+
+
+ARCHIVE_MODELS = {
+    "companies": CompanyESG,
+    "news": ESGNews,
+    "reports": CompanyReport,
+}
+
+PERIODS = ("day", "week", "month", "quarter", "year")
+
+ARCHIVE_FORMAT_VERSION = 1
+
+
+class _ArchiveEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder, but keeping full microsecond precision."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class LifecycleError(Exception):
+    """Raised when a retention, archival or restore operation cannot run."""
+
+
+@dataclass
+class LifecycleResult:
+    dataset: str
+    rows: int
+    archive_path: Optional[Path] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "dataset": self.dataset,
+            "rows": self.rows,
+            "archive_path": str(self.archive_path) if self.archive_path else None,
+        }
+
+
+# Rows per UPDATE when writing timestamps back; bulk_update builds a CASE
+# with one branch per row, which gets slow for large batches.
+_TIMESTAMP_BATCH_SIZE = 500
+
+
+def bulk_create_with_timestamps(model, objs: Iterable) -> list:
+    """
+    Bulk insert `objs`, keeping the `created_at` values they carry.
+
+    `auto_now_add` overwrites `created_at` on insert, so the given values are
+    written back with bulk updates in the same transaction. The field itself
+    is left untouched, so other inserts of `model` are not affected.
+    """
+    objs = list(objs)
+    stamps = [obj.created_at for obj in objs]
+    with transaction.atomic():
+        model.objects.bulk_create(objs)
+        for obj, stamp in zip(objs, stamps):
+            obj.created_at = stamp
+        model.objects.bulk_update(objs, ["created_at"], batch_size=_TIMESTAMP_BATCH_SIZE)
+    return objs
+
+
+def _model_for(dataset: str):
+    try:
+        return ARCHIVE_MODELS[dataset]
+    except KeyError:
+        raise LifecycleError(
+            f"Unknown dataset '{dataset}'. Expected one of: {', '.join(ARCHIVE_MODELS)}."
+        ) from None
+
+
+def period_start(value: datetime, period: str) -> datetime:
+    """Start of the `period` containing `value`, in the current time zone."""
+    if period not in PERIODS:
+        raise LifecycleError(f"Period must be one of: {', '.join(PERIODS)}.")
+    local = timezone.localtime(value) if timezone.is_aware(value) else value
+    start = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "week":
+        start -= timedelta(days=start.weekday())
+    elif period == "month":
+        start = start.replace(day=1)
+    elif period == "quarter":
+        start = start.replace(month=3 * ((start.month - 1) // 3) + 1, day=1)
+    elif period == "year":
+        start = start.replace(month=1, day=1)
+    return start
+
+
+def _protected_records():
+    return CompanyLatestScore.objects.filter(record__isnull=False).values("record_id")
+
+
+def _protected_reports():
+    newest = CompanyReport.objects.filter(company=OuterRef("company")).order_by("-created_at", "-id")
+    return CompanyReport.objects.filter(id=Subquery(newest.values("id")[:1])).values("id")
+
+
+def _chunks(ids: Sequence[int], size: int) -> Iterator[Sequence[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _write_archive(dataset: str, ids: Sequence[int], directory: Optional[Path], chunk_size: int) -> Path:
+    """Write the rows with `ids` to a new archive file and return its path."""
+    model = _model_for(dataset)
+    fields = [field.attname for field in model._meta.concrete_fields]
+
+    directory = Path(directory or settings.ESG_ARCHIVE_DIR) / dataset
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{dataset}-{timezone.now():%Y%m%dT%H%M%S%f}.jsonl.gz"
+    partial = path.with_name(path.name + ".partial")
+
+    with gzip.open(partial, "wt", encoding="utf-8") as f:
+        header = {"format": ARCHIVE_FORMAT_VERSION, "dataset": dataset, "fields": fields}
+        f.write(json.dumps(header) + "\n")
+        for batch in _chunks(ids, chunk_size):
+            for row in model.objects.filter(id__in=list(batch)).order_by("id").values(*fields):
+                f.write(json.dumps(row, cls=_ArchiveEncoder) + "\n")
+    with open(partial, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+    return path
+
+
+def _delete(model, ids: Sequence[int], chunk_size: int) -> None:
+    # QuerySet.delete() applies CASCADE / SET_NULL to dependent rows.
+    for batch in _chunks(ids, chunk_size):
+        with transaction.atomic():
+            model.objects.filter(id__in=list(batch)).delete()
+
+
+def _retire(
+    dataset: str,
+    ids: Sequence[int],
+    archive: bool,
+    directory: Optional[Path],
+    chunk_size: int,
+    dry_run: bool,
+) -> LifecycleResult:
+    result = LifecycleResult(dataset=dataset, rows=len(ids))
+    if dry_run or not ids:
+        return result
+    if archive:
+        result.archive_path = _write_archive(dataset, ids, directory, chunk_size)
+    _delete(_model_for(dataset), ids, chunk_size)
+    return result
+
+
+def compact_company_snapshots(
+    before: datetime,
+    period: str = "month",
+    archive: bool = False,
+    directory: Optional[Path] = None,
+    chunk_size: int = 10_000,
+    dry_run: bool = False,
+) -> LifecycleResult:
+    """
+    Keep only the latest CompanyESG snapshot per company and `period` among
+    rows created before `before`. The cutoff is rounded down to a period
+    boundary so partially elapsed periods are never compacted.
+
+    With `archive`, removed rows are written to an archive file first.
+    """
+    cutoff = period_start(before, period)
+    ranked = (
+        CompanyESG.objects.filter(created_at__lt=cutoff)
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=[F("company"), Trunc("created_at", period)],
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(rank__gt=1)
+        .values_list("id", flat=True)
+    )
+    protected = set(_protected_records().values_list("record_id", flat=True))
+    ids = array("q", sorted(i for i in ranked.iterator(chunk_size=chunk_size) if i not in protected))
+    return _retire("companies", ids, archive, directory, chunk_size, dry_run)
+
+
+def archive_rows(
+    dataset: str,
+    before: datetime,
+    directory: Optional[Path] = None,
+    chunk_size: int = 10_000,
+    dry_run: bool = False,
+) -> LifecycleResult:
+    """Move rows of `dataset` created before `before` into an archive file."""
+    model = _model_for(dataset)
+    queryset = model.objects.filter(created_at__lt=before)
+    if model is CompanyESG:
+        queryset = queryset.exclude(id__in=_protected_records())
+    elif model is CompanyReport:
+        queryset = queryset.exclude(id__in=_protected_reports())
+    ids = array("q", queryset.order_by("id").values_list("id", flat=True).iterator(chunk_size=chunk_size))
+    return _retire(dataset, ids, True, directory, chunk_size, dry_run)
+
+
+def restore_archive(path: Path, chunk_size: int = 5_000) -> LifecycleResult:
+    """Insert the rows of an archive file that are not already present."""
+    path = Path(path)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError as exc:
+            raise LifecycleError(f"{path} is not an ESG archive file.") from exc
+        if header.get("format") != ARCHIVE_FORMAT_VERSION:
+            raise LifecycleError(f"{path} has an unsupported archive format.")
+
+        dataset = header.get("dataset")
+        model = _model_for(dataset)
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        previous_max = model.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+        restored = 0
+        highest = 0
+
+        def insert(rows):
+            existing = set(
+                model.objects.filter(id__in=[row["id"] for row in rows]).values_list("id", flat=True)
+            )
+            objs = [
+                model(**{name: fields[name].to_python(value) for name, value in row.items()})
+                for row in rows
+                if row["id"] not in existing
+            ]
+            bulk_create_with_timestamps(model, objs)
+            return len(objs)
+
+        with transaction.atomic():
+            batch = []
+            for line in f:
+                row = json.loads(line)
+                highest = max(highest, row["id"])
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    restored += insert(batch)
+                    batch = []
+            if batch:
+                restored += insert(batch)
+
+            # Keep the id sequence ahead of explicitly inserted ids.
+            if highest > previous_max:
+                with connection.cursor() as cursor:
+                    for statement in connection.ops.sequence_reset_sql(no_style(), [model]):
+                        cursor.execute(statement)
+
+    return LifecycleResult(dataset=dataset, rows=restored, archive_path=path)
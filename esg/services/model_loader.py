@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import pickle
 from pathlib import Path
@@ -10,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 
 _MODEL: Optional[Any] = None
+_MODEL_VERSION: Optional[str] = None
 
 
 def _model_path() -> Path:
@@ -46,9 +48,31 @@ def get_esg_model() -> Optional[Any]:
 
     Returns None if loading failed; callers should handle this case.
     """
-    global _MODEL  # noqa: PLW0603
+    global _MODEL, _MODEL_VERSION  # noqa: PLW0603
 
     if _MODEL is None:
         _MODEL = _load_model()
+        _MODEL_VERSION = _model_digest() if _MODEL is not None else None
     return _MODEL
 
+
+def _model_digest() -> Optional[str]:
+    """Return a short SHA-256 digest of the model file's contents."""
+    digest = hashlib.sha256()
+    try:
+        with _model_path().open("rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()[:16]
+
+
+def get_model_version() -> Optional[str]:
+    """
+    Return an identifier for the loaded model, derived from the model file's
+    contents, or None if no model is available.
+    """
+    get_esg_model()
+    return _MODEL_VERSION
+
@@ -0,0 +1,264 @@
+"""
+Optional time-range partitioning of the append-only ESG tables on PostgreSQL.
+
+`partition_table` converts a table into one partitioned by RANGE (created_at)
+with a partition per year or month plus a DEFAULT partition, copying the
+existing rows in a single transaction. `ensure_partitions` then creates
+upcoming partitions ahead of time and should be run periodically (e.g. from
+cron via the `partition_tables` command). Queries filtered on `created_at`
+only scan the partitions they need, and old partitions stay small and cold.
+
+PostgreSQL requires a partitioned table's primary key to include the
+partition key, so the key becomes (id, created_at). `id` keeps coming from a
+sequence and stays unique in practice, but it can no longer be the target of
+a foreign key. The foreign keys to CompanyESG (CompanyLatestScore.record and
+CompanyESGModelScore.record) are therefore declared with db_constraint=False
+(migration 0009), and Django applies their `on_delete` behaviour itself. A
+table that is still referenced by a database constraint is not converted.
+"""
+
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from esg.models import CompanyESG, CompanyReport, ESGNews
+
+
+PARTITIONED_MODELS = {
+    "companies": CompanyESG,
+    "news": ESGNews,
+    "reports": CompanyReport,
+}
+
+INTERVALS = ("month", "year")
+
+
+class PartitioningError(Exception):
+    """Raised when a table cannot be partitioned."""
+
+
+def _quote(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def _period_start(value: date, interval: str) -> date:
+    return date(value.year, 1, 1) if interval == "year" else date(value.year, value.month, 1)
+
+
+def _next_period(start: date, interval: str) -> date:
+    if interval == "year":
+        return date(start.year + 1, 1, 1)
+    return date(start.year + (start.month // 12), start.month % 12 + 1, 1)
+
+
+def _partition_name(table: str, start: date, interval: str) -> str:
+    suffix = f"{start:%Y}" if interval == "year" else f"{start:%Y%m}"
+    return f"{table}_p{suffix}"
+
+
+def _bound(value: date) -> str:
+    # Partition bounds are UTC midnights, written as literals.
+    return "'" + datetime(value.year, value.month, value.day, tzinfo=dt_timezone.utc).isoformat() + "'"
+
+
+def _periods(first: date, last: date, interval: str) -> List[Tuple[date, date]]:
+    periods = []
+    start = _period_start(first, interval)
+    while start <= last:
+        end = _next_period(start, interval)
+        periods.append((start, end))
+        start = end
+    return periods
+
+
+def _require_postgres() -> None:
+    if connection.vendor != "postgresql":
+        raise PartitioningError("Table partitioning is only supported on PostgreSQL.")
+
+
+def is_partitioned(table: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [table],
+        )
+        return bool(cursor.fetchone()[0])
+
+
+def _existing_partitions(table: str) -> Dict[str, str]:
+    """Partition name -> bound expression."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [table],
+        )
+        return dict(cursor.fetchall())
+
+
+def _detect_interval(table: str) -> Optional[str]:
+    prefix = f"{table}_p"
+    for name in _existing_partitions(table):
+        if name.startswith(prefix):
+            return "year" if len(name) - len(prefix) == 4 else "month"
+    return None
+
+
+def _insertable_columns(table: str) -> List[str]:
+    """Columns that accept explicit values (generated columns are skipped)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT attname FROM pg_attribute
+            WHERE attrelid = to_regclass(%s) AND attnum > 0
+              AND NOT attisdropped AND attgenerated = ''
+            ORDER BY attnum
+            """,
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _conversion_statements(table: str, interval: str, ahead: int) -> List[str]:
+    old = f"{table}_unpartitioned"
+    sequence = f"{table}_pid_seq"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname FROM pg_constraint
+            WHERE contype = 'f' AND confrelid = to_regclass(%s)
+            """,
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        if foreign_keys:
+            names = ", ".join(f"{referencing}.{name}" for referencing, name in foreign_keys)
+            raise PartitioningError(
+                f"{table} is referenced by foreign key constraints ({names}); "
+                "run `manage.py migrate` first."
+            )
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i
+            WHERE i.indrelid = to_regclass(%s) AND NOT i.indisprimary AND NOT i.indisunique
+            """,
+            [table],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT MIN(created_at), MAX(created_at) FROM {_quote(table)}")
+        first, last = cursor.fetchone()
+
+    today = timezone.now().date()
+    first = first.date() if first else today
+    last = max(last.date() if last else today, today)
+    for _ in range(ahead):
+        last = _next_period(_period_start(last, interval), interval)
+
+    columns = ", ".join(_quote(name) for name in _insertable_columns(table))
+    statements = [
+        f"LOCK TABLE {_quote(table)} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {_quote(table)} RENAME TO {_quote(old)}",
+        f"CREATE TABLE {_quote(table)} (LIKE {_quote(old)} INCLUDING DEFAULTS INCLUDING GENERATED "
+        f"INCLUDING CONSTRAINTS INCLUDING STORAGE) PARTITION BY RANGE (created_at)",
+        f"CREATE SEQUENCE {_quote(sequence)} OWNED BY {_quote(table)}.id",
+        f"ALTER TABLE {_quote(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')",
+    ]
+    statements += [
+        f"CREATE TABLE {_quote(_partition_name(table, start, interval))} PARTITION OF {_quote(table)} "
+        f"FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})"
+        for start, end in _periods(first, last, interval)
+    ]
+    statements += [
+        f"CREATE TABLE {_quote(table + '_default')} PARTITION OF {_quote(table)} DEFAULT",
+        f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} FROM {_quote(old)}",
+        f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {_quote(old)}), 0) + 1, false)",
+        f"DROP TABLE {_quote(old)}",
+        # Added once the old table (and its `<table>_pkey`) is gone, so the
+        # key keeps its usual name.
+        f"ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(table + '_pkey')} PRIMARY KEY (id, created_at)",
+    ]
+    # Index definitions were read before the rename, so they already name
+    # the new parent table; building them after the copy is faster.
+    statements += index_definitions
+    statements.append(f"ANALYZE {_quote(table)}")
+    return statements
+
+
+def _has_rows(table: str, condition: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {_quote(table)} WHERE {condition})")
+        return bool(cursor.fetchone()[0])
+
+
+def _missing_partition_statements(table: str, interval: str, ahead: int) -> List[str]:
+    existing = _existing_partitions(table)
+    default = f"{table}_default"
+    columns = ", ".join(_quote(name) for name in _insertable_columns(table))
+
+    today = timezone.now().date()
+    last = today
+    for _ in range(ahead):
+        last = _next_period(_period_start(last, interval), interval)
+
+    statements = []
+    for start, end in _periods(today, last, interval):
+        name = _partition_name(table, start, interval)
+        if name in existing:
+            continue
+        in_range = f"created_at >= {_bound(start)} AND created_at < {_bound(end)}"
+        create = (
+            f"CREATE TABLE {_quote(name)} PARTITION OF {_quote(table)} "
+            f"FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})"
+        )
+        if default not in existing or not _has_rows(default, in_range):
+            statements.append(create)
+            continue
+        # Rows that already landed in the DEFAULT partition must move into
+        # the new partition, which PostgreSQL only allows while detached.
+        statements += [
+            f"ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(default)}",
+            create,
+            f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} FROM {_quote(default)} WHERE {in_range}",
+            f"DELETE FROM {_quote(default)} WHERE {in_range}",
+            f"ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(default)} DEFAULT",
+        ]
+    return statements
+
+
+def partition_table(
+    dataset: str,
+    interval: str = "year",
+    ahead: int = 2,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Partition `dataset`'s table by `interval`, or just create the next
+    `ahead` partitions if it is already partitioned. Returns the SQL run
+    (or, with `dry_run`, the SQL that would run).
+    """
+    _require_postgres()
+    if dataset not in PARTITIONED_MODELS:
+        raise PartitioningError(f"Unknown dataset '{dataset}'.")
+    if interval not in INTERVALS:
+        raise PartitioningError(f"Interval must be one of: {', '.join(INTERVALS)}.")
+
+    table = PARTITIONED_MODELS[dataset]._meta.db_table
+    with transaction.atomic():
+        if is_partitioned(table):
+            interval = _detect_interval(table) or interval
+            statements = _missing_partition_statements(table, interval, ahead)
+        else:
+            statements = _conversion_statements(table, interval, ahead)
+
+        if not dry_run:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+    return statements
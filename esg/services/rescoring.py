@@ -0,0 +1,268 @@
+"""
+Batch rescoring of historical CompanyESG rows with the current ESG model.
+
+Rows are streamed in primary-key order with `.iterator()`, predicted in
+vectorised chunks (optionally across a process pool) and bulk-written to
+CompanyESGModelScore under the model's version. A per-version checkpoint
+is committed with every chunk, so an interrupted run resumes where it
+stopped.
+
+A run claims its checkpoint (`running`) under select_for_update(), so only
+one run per model version is active across all processes. A claim whose
+checkpoint has not been updated for `ESG_RESCORE_STALE_SECONDS` is
+considered abandoned and can be taken over. Each claim gets a fresh
+`claim_token`; checkpoint writes and the release are conditional on it, so a
+run whose claim was taken over stops with `RescoreClaimLost` instead of
+overwriting the new run's progress.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from esg.models import CompanyESG, CompanyESGModelScore, RescoreCheckpoint
+from esg.services.model_loader import get_esg_model, get_model_version
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# Same feature order as ESGPredictView.
+FEATURE_FIELDS = [
+    "sentiment_score",
+    "environmental_score",
+    "social_score",
+    "governance_score",
+]
+
+
+class RescoreError(Exception):
+    """Raised when a rescoring run cannot start."""
+
+
+class RescoreClaimLost(RescoreError):
+    """Raised when another run took over this run's claim."""
+
+    def __init__(self, version: str) -> None:
+        super().__init__(f"Rescoring for model {version} was taken over by another run.")
+
+
+def _predict_chunk(features: "np.ndarray") -> "np.ndarray":
+    """Predict one chunk; runs in pool workers, which load the model lazily."""
+    import numpy as np
+
+    model = get_esg_model()
+    return np.asarray(model.predict(features), dtype=float)
+
+
+def _iter_chunks(after_id: int, chunk_size: int) -> Iterator[Tuple[List[int], "np.ndarray"]]:
+    import numpy as np
+
+    rows = (
+        CompanyESG.objects.filter(id__gt=after_id)
+        .order_by("id")
+        .values_list("id", *FEATURE_FIELDS)
+    )
+    ids: List[int] = []
+    features: List[tuple] = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        ids.append(row[0])
+        features.append(row[1:])
+        if len(ids) >= chunk_size:
+            yield ids, np.asarray(features, dtype=float)
+            ids, features = [], []
+    if ids:
+        yield ids, np.asarray(features, dtype=float)
+
+
+def _write_chunk(
+    checkpoint: RescoreCheckpoint,
+    ids: List[int],
+    predictions: "np.ndarray",
+    elapsed: float,
+) -> None:
+    with transaction.atomic():
+        # Rows already scored by this version (e.g. after --restart) are
+        # skipped, so rows_scored only counts rows actually inserted.
+        existing = set(
+            CompanyESGModelScore.objects.filter(
+                model_version=checkpoint.model_version, record_id__in=ids
+            ).values_list("record_id", flat=True)
+        )
+        scores = [
+            CompanyESGModelScore(
+                record_id=record_id,
+                model_version=checkpoint.model_version,
+                predicted_esg_score=float(score),
+            )
+            for record_id, score in zip(ids, predictions)
+            if record_id not in existing
+        ]
+        CompanyESGModelScore.objects.bulk_create(scores, ignore_conflicts=True)
+        # Raising here also rolls back the scores written above.
+        _update_claimed(
+            checkpoint,
+            last_record_id=ids[-1],
+            rows_scored=F("rows_scored") + len(scores),
+            elapsed_seconds=F("elapsed_seconds") + elapsed,
+        )
+        checkpoint.last_record_id = ids[-1]
+        checkpoint.rows_scored += len(scores)
+        checkpoint.elapsed_seconds += elapsed
+
+
+def _update_claimed(checkpoint: RescoreCheckpoint, **fields) -> None:
+    """Update `checkpoint` only while this run still holds its claim."""
+    updated = RescoreCheckpoint.objects.filter(
+        pk=checkpoint.pk, claim_token=checkpoint.claim_token
+    ).update(updated_at=timezone.now(), **fields)
+    if not updated:
+        raise RescoreClaimLost(checkpoint.model_version)
+
+
+def claim_rescore(version: str, restart: bool = False) -> RescoreCheckpoint:
+    """
+    Mark the checkpoint of `version` as running and return it.
+
+    Raises RescoreError if another run, in any process, holds a live claim.
+    """
+    stale_after = timedelta(seconds=getattr(settings, "ESG_RESCORE_STALE_SECONDS", 600))
+    with transaction.atomic():
+        RescoreCheckpoint.objects.get_or_create(model_version=version)
+        checkpoint = RescoreCheckpoint.objects.select_for_update().get(model_version=version)
+        if checkpoint.running and checkpoint.updated_at > timezone.now() - stale_after:
+            raise RescoreError(f"Rescoring for model {version} is already running.")
+
+        checkpoint.running = True
+        checkpoint.claim_token = uuid.uuid4()
+        if restart:
+            checkpoint.last_record_id = 0
+            checkpoint.rows_scored = 0
+            checkpoint.elapsed_seconds = 0.0
+            checkpoint.completed_at = None
+        checkpoint.save()
+    return checkpoint
+
+
+def _release(checkpoint: RescoreCheckpoint) -> None:
+    """Clear the claim, unless another run has taken it over meanwhile."""
+    RescoreCheckpoint.objects.filter(pk=checkpoint.pk, claim_token=checkpoint.claim_token).update(
+        running=False, claim_token=None
+    )
+    checkpoint.running = False
+    checkpoint.claim_token = None
+
+
+def rescore_company_esg(
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    restart: bool = False,
+    progress: Optional[Callable[[RescoreCheckpoint], None]] = None,
+    checkpoint: Optional[RescoreCheckpoint] = None,
+) -> RescoreCheckpoint:
+    """
+    Score every CompanyESG row not yet scored by the current model version.
+
+    `progress` is called with the checkpoint after each committed chunk.
+    A `checkpoint` already returned by `claim_rescore` is used as is;
+    otherwise the run claims one itself. The claim is released on return.
+    """
+    model = get_esg_model()
+    version = get_model_version()
+    if model is None or version is None:
+        raise RescoreError("Prediction model is not available.")
+
+    if checkpoint is None:
+        checkpoint = claim_rescore(version, restart=restart)
+    try:
+        return _rescore(model, checkpoint, chunk_size, workers, progress)
+    finally:
+        _release(checkpoint)
+
+
+def _rescore(
+    model,
+    checkpoint: RescoreCheckpoint,
+    chunk_size: int,
+    workers: int,
+    progress: Optional[Callable[[RescoreCheckpoint], None]],
+) -> RescoreCheckpoint:
+    import numpy as np
+
+    chunks = _iter_chunks(checkpoint.last_record_id, chunk_size)
+    started = time.perf_counter()
+
+    def commit(ids: List[int], predictions: "np.ndarray") -> None:
+        nonlocal started
+        now = time.perf_counter()
+        _write_chunk(checkpoint, ids, predictions, now - started)
+        started = now
+        if progress is not None:
+            progress(checkpoint)
+
+    if workers > 1:
+        # Keep a bounded window of chunks in flight and commit them in order,
+        # so the checkpoint only ever advances past fully written rows.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for ids, features in chunks:
+                pending.append((ids, pool.submit(_predict_chunk, features)))
+                if len(pending) >= workers * 2:
+                    done_ids, future = pending.popleft()
+                    commit(done_ids, future.result())
+            while pending:
+                done_ids, future = pending.popleft()
+                commit(done_ids, future.result())
+    else:
+        for ids, features in chunks:
+            commit(ids, np.asarray(model.predict(features), dtype=float))
+
+    checkpoint.completed_at = timezone.now()
+    _update_claimed(checkpoint, completed_at=checkpoint.completed_at)
+    logger.info(
+        "Rescored %s CompanyESG rows with model %s at %.0f rows/s",
+        checkpoint.rows_scored,
+        checkpoint.model_version,
+        checkpoint.rows_per_second,
+    )
+    return checkpoint
+
+
+def start_background_rescore(chunk_size: int = 10_000) -> str:
+    """
+    Claim the current model version and rescore it in a daemon thread.
+
+    Returns the model version being scored. Raises RescoreError if no model
+    is available or a run for this version is already in progress in any
+    process.
+    """
+    version = get_model_version()
+    if version is None:
+        raise RescoreError("Prediction model is not available.")
+    checkpoint = claim_rescore(version)
+
+    def run() -> None:
+        try:
+            rescore_company_esg(chunk_size=chunk_size, checkpoint=checkpoint)
+        except RescoreClaimLost as exc:
+            logger.warning("%s", exc)
+        except Exception:  # noqa: BLE001
+            logger.exception("Background rescoring for model %s failed", version)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=run, name=f"esg-rescore-{version}", daemon=True).start()
+    return version
@@ -0,0 +1,239 @@
+"""
+Registry of tabular schema mappings used by ZIP ingestion.
+
+Mappings come from three places, highest precedence first:
+1. Active `SchemaMapping` rows in the database.
+2. `settings.ESG_SCHEMA_MAPPINGS` (a list of dicts with the same keys).
+3. The built-in mappings below, which describe the original upload formats.
+
+Mappings that fail `mapping_errors` (see also `SchemaMapping.clean()`) are
+logged and left out of the registry, so one bad row cannot break every upload.
+
+Detection only needs a file's header. Each distinct header is resolved to a
+`CompiledMapping` once and cached, and the compiled mapping carries the
+`usecols`/`dtype` hints used to parse just the needed columns.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from esg.models import SchemaMapping
+
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_MAPPINGS: List[Dict[str, object]] = [
+    {
+        "name": "builtin_company_esg",
+        "target": SchemaMapping.TARGET_COMPANY_ESG,
+        "columns": {
+            "company": ["company"],
+            "sentiment_score": ["sentiment_score"],
+            "environmental_score": ["environmental_score", "environmental", "env_score"],
+            "social_score": ["social_score", "social", "soc_score"],
+            "governance_score": ["governance_score", "governance", "gov_score"],
+            "esg_score": ["esg_score", "esg"],
+        },
+        "required": ["company", "sentiment_score"],
+        "dtypes": {
+            "company": "str",
+            "sentiment_score": "float64",
+            "environmental_score": "float64",
+            "social_score": "float64",
+            "governance_score": "float64",
+            "esg_score": "float64",
+        },
+    },
+    {
+        "name": "builtin_news",
+        "target": SchemaMapping.TARGET_NEWS,
+        "columns": {
+            "title": ["title"],
+            "summary": ["summary", "description", "body"],
+            "sentiment_score": ["sentiment_score", "sentiment"],
+            "sentiment_label": ["sentiment_label", "label"],
+        },
+        # Sentiment is scored locally when missing.
+        "required": ["title"],
+        "dtypes": {
+            "title": "str",
+            "summary": "str",
+            "sentiment_score": "float64",
+            "sentiment_label": "str",
+        },
+    },
+]
+
+
+# Canonical fields per target, and the ones every mapping must require
+# because ingestion cannot create a row without them.
+CANONICAL_FIELDS: Dict[str, List[str]] = {str(m["target"]): list(m["columns"]) for m in BUILTIN_MAPPINGS}
+REQUIRED_FIELDS: Dict[str, List[str]] = {str(m["target"]): list(m["required"]) for m in BUILTIN_MAPPINGS}
+
+
+def mapping_errors(spec: Dict[str, object]) -> Dict[str, List[str]]:
+    """Validate a mapping spec, returning error messages keyed by field."""
+    errors: Dict[str, List[str]] = {}
+    target = spec.get("target")
+    if not isinstance(target, str) or target not in CANONICAL_FIELDS:
+        errors["target"] = [f"Unknown target {target!r}; expected one of {sorted(CANONICAL_FIELDS)}."]
+        return errors
+    known = CANONICAL_FIELDS[target]
+
+    columns = spec.get("columns")
+    if not isinstance(columns, dict) or not columns:
+        errors["columns"] = ["Must be a non-empty object mapping canonical fields to header aliases."]
+        return errors
+    for field, aliases in columns.items():
+        if field not in known:
+            errors.setdefault("columns", []).append(
+                f"Unknown field {field!r} for {target}; expected one of {known}."
+            )
+        elif (
+            not isinstance(aliases, list)
+            or not aliases
+            or not all(isinstance(alias, str) and alias.strip() for alias in aliases)
+        ):
+            errors.setdefault("columns", []).append(
+                f"Aliases for {field!r} must be a non-empty list of header names."
+            )
+
+    required = spec.get("required") or []
+    if not isinstance(required, list):
+        errors["required"] = ["Must be a list of canonical fields."]
+    else:
+        missing = [field for field in REQUIRED_FIELDS[target] if field not in required]
+        if missing:
+            errors.setdefault("required", []).append(f"Must include {missing} for {target}.")
+        unmapped = [field for field in required if field not in columns]
+        if unmapped:
+            errors.setdefault("required", []).append(f"Fields {unmapped} have no entry in columns.")
+
+    dtypes = spec.get("dtypes") or {}
+    if not isinstance(dtypes, dict):
+        errors["dtypes"] = ["Must be an object mapping canonical fields to dtypes."]
+    else:
+        from pandas.api.types import pandas_dtype
+
+        for field, dtype in dtypes.items():
+            if field not in columns:
+                errors.setdefault("dtypes", []).append(f"Field {field!r} has no entry in columns.")
+                continue
+            try:
+                pandas_dtype(dtype)
+            except (TypeError, ValueError):
+                errors.setdefault("dtypes", []).append(f"Invalid dtype {dtype!r} for {field!r}.")
+    return errors
+
+
+@dataclass(frozen=True)
+class CompiledMapping:
+    """A mapping resolved against one concrete header."""
+
+    name: str
+    target: str
+    # Canonical field -> header column name as it appears in the file.
+    columns: Dict[str, str]
+    dtypes: Dict[str, str]
+
+    @property
+    def usecols(self) -> List[str]:
+        return list(self.columns.values())
+
+    @property
+    def read_dtypes(self) -> Dict[str, str]:
+        """`dtype` hints keyed by the file's header names."""
+        return {
+            header: self.dtypes[field]
+            for field, header in self.columns.items()
+            if field in self.dtypes
+        }
+
+    @property
+    def renames(self) -> Dict[str, str]:
+        """Header name -> canonical field, for normalising a parsed frame."""
+        return {header: field for field, header in self.columns.items()}
+
+
+class SchemaRegistry:
+    """An ordered set of mappings with a per-header-signature match cache."""
+
+    def __init__(self, mappings: Sequence[Dict[str, object]]) -> None:
+        self._mappings = []
+        for m in mappings:
+            errors = mapping_errors(m)
+            if errors:
+                logger.warning("Ignoring invalid schema mapping %r: %s", m.get("name"), errors)
+                continue
+            self._mappings.append(
+                (
+                    str(m["name"]),
+                    str(m["target"]),
+                    {
+                        field: [alias.strip().lower() for alias in aliases]
+                        for field, aliases in dict(m["columns"]).items()
+                    },
+                    list(m.get("required") or []),
+                    dict(m.get("dtypes") or {}),
+                )
+            )
+        self._cache: Dict[Tuple[str, ...], Optional[CompiledMapping]] = {}
+
+    def match(self, header: Sequence[str]) -> Optional[CompiledMapping]:
+        """Return the first mapping whose required fields `header` provides."""
+        signature = tuple(header)
+        if signature not in self._cache:
+            self._cache[signature] = self._compile(signature)
+        return self._cache[signature]
+
+    def _compile(self, header: Tuple[str, ...]) -> Optional[CompiledMapping]:
+        lowered: Dict[str, str] = {}
+        for column in header:
+            lowered.setdefault(str(column).strip().lower(), column)
+
+        for name, target, columns, required, dtypes in self._mappings:
+            resolved: Dict[str, str] = {}
+            for field, aliases in columns.items():
+                for alias in aliases:
+                    if alias in lowered:
+                        resolved[field] = lowered[alias]
+                        break
+            if all(field in resolved for field in required):
+                return CompiledMapping(name=name, target=target, columns=resolved, dtypes=dtypes)
+        return None
+
+
+_REGISTRY: Optional[SchemaRegistry] = None
+_REGISTRY_SIGNATURE: Optional[Tuple[object, ...]] = None
+
+
+def _database_mappings() -> List[Dict[str, object]]:
+    return list(
+        SchemaMapping.objects.filter(is_active=True)
+        .order_by("-priority", "name")
+        .values("name", "target", "columns", "required", "dtypes")
+    )
+
+
+def get_registry() -> SchemaRegistry:
+    """
+    Return the current registry, rebuilding it only when the database
+    mappings have changed since the last call.
+    """
+    global _REGISTRY, _REGISTRY_SIGNATURE  # noqa: PLW0603
+
+    state = SchemaMapping.objects.aggregate(count=Count("id"), updated=Max("updated_at"))
+    signature = (state["count"], state["updated"])
+    if _REGISTRY is None or signature != _REGISTRY_SIGNATURE:
+        mappings = (
+            _database_mappings()
+            + list(getattr(settings, "ESG_SCHEMA_MAPPINGS", []))
+            + BUILTIN_MAPPINGS
+        )
+        _REGISTRY = SchemaRegistry(mappings)
+        _REGISTRY_SIGNATURE = signature
+    return _REGISTRY
@@ -0,0 +1,157 @@
+"""
+Ranked full-text search over news and fuzzy search over company names.
+
+Uses the indexes created by migration 0004: tsvector/GIN and pg_trgm on
+PostgreSQL, FTS5 on SQLite. Other backends fall back to `icontains`.
+"""
+
+import re
+from typing import List, Tuple
+
+from django.db import connection, transaction
+
+from esg.models import CompanyLatestScore, ESGNews
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Minimum pg_trgm similarity for a fuzzy company match.
+COMPANY_SIMILARITY_THRESHOLD = 0.2
+
+
+def _fts5_match(query: str) -> str:
+    """Turn free text into an FTS5 query of AND-ed, prefix-matched tokens."""
+    tokens = _TOKEN_RE.findall(query)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _fts5_trigrams(query: str) -> str:
+    """Turn free text into an FTS5 trigram query OR-ing every trigram."""
+    text = query.strip().lower()
+    grams = {text[i : i + 3] for i in range(len(text) - 2)}
+    return " OR ".join('"{}"'.format(gram.replace('"', '""')) for gram in sorted(grams))
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so `value` only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _ordered_objects(model, ids: List[int]) -> list:
+    by_id = model.objects.in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id]
+
+
+def search_news(query: str, page: int, page_size: int) -> Tuple[int, list]:
+    """
+    Return `(total, results)` for a ranked news search.
+
+    Each result is an ESGNews instance annotated with a `rank` attribute where
+    higher is more relevant.
+    """
+    offset = (page - 1) * page_size
+    vendor = connection.vendor
+
+    if vendor == "postgresql":
+        where = "search_vector @@ websearch_to_tsquery('english', %s)"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM esg_esgnews WHERE {where}", [query])
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                "SELECT id, ts_rank(search_vector, websearch_to_tsquery('english', %s)) AS rank "
+                f"FROM esg_esgnews WHERE {where} "
+                "ORDER BY rank DESC, id DESC LIMIT %s OFFSET %s",
+                [query, query, page_size, offset],
+            )
+            hits = cursor.fetchall()
+    elif vendor == "sqlite":
+        match = _fts5_match(query)
+        if not match:
+            return 0, []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM esg_esgnews_fts WHERE esg_esgnews_fts MATCH %s",
+                [match],
+            )
+            total = cursor.fetchone()[0]
+            # bm25() is lower-is-better; negate so rank reads like ts_rank.
+            cursor.execute(
+                "SELECT rowid, -bm25(esg_esgnews_fts, 2.0, 1.0) AS rank "
+                "FROM esg_esgnews_fts WHERE esg_esgnews_fts MATCH %s "
+                "ORDER BY rank DESC, rowid DESC LIMIT %s OFFSET %s",
+                [match, page_size, offset],
+            )
+            hits = cursor.fetchall()
+    else:
+        qs = ESGNews.objects.filter(title__icontains=query) | ESGNews.objects.filter(
+            summary__icontains=query
+        )
+        total = qs.count()
+        hits = [(pk, 0.0) for pk in qs.values_list("id", flat=True)[offset : offset + page_size]]
+
+    ranks = dict(hits)
+    results = _ordered_objects(ESGNews, [pk for pk, _ in hits])
+    for item in results:
+        item.rank = float(ranks[item.pk])
+    return total, results
+
+
+def search_companies(query: str, page: int, page_size: int) -> Tuple[int, list]:
+    """
+    Return `(total, results)` for a fuzzy company name search, best matches
+    first.
+
+    Each result is a CompanyLatestScore instance annotated with a `rank`.
+    """
+    offset = (page - 1) * page_size
+    vendor = connection.vendor
+
+    if vendor == "postgresql":
+        # `%` and ILIKE can both use the trigram GIN index; a similarity()
+        # comparison cannot, so the threshold is set for the `%` operator.
+        where = "company ILIKE %s OR company %% %s"
+        where_params = [f"%{_escape_like(query)}%", query]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+                [str(COMPANY_SIMILARITY_THRESHOLD)],
+            )
+            cursor.execute(f"SELECT count(*) FROM esg_companylatestscore WHERE {where}", where_params)
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                "SELECT id, similarity(company, %s) AS rank FROM esg_companylatestscore "
+                f"WHERE {where} "
+                "ORDER BY rank DESC, company LIMIT %s OFFSET %s",
+                [query, *where_params, page_size, offset],
+            )
+            hits = cursor.fetchall()
+    elif vendor == "sqlite":
+        match = _fts5_trigrams(query)
+        if match:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT count(*) FROM esg_company_fts WHERE esg_company_fts MATCH %s",
+                    [match],
+                )
+                total = cursor.fetchone()[0]
+                cursor.execute(
+                    "SELECT rowid, -bm25(esg_company_fts) AS rank FROM esg_company_fts "
+                    "WHERE esg_company_fts MATCH %s ORDER BY rank DESC, rowid LIMIT %s OFFSET %s",
+                    [match, page_size, offset],
+                )
+                hits = cursor.fetchall()
+        else:
+            # Trigram tokenizer cannot match queries shorter than 3 characters.
+            qs = CompanyLatestScore.objects.filter(company__istartswith=query.strip()).order_by("company")
+            total = qs.count()
+            hits = [(pk, 0.0) for pk in qs.values_list("id", flat=True)[offset : offset + page_size]]
+    else:
+        qs = CompanyLatestScore.objects.filter(company__icontains=query).order_by("company")
+        total = qs.count()
+        hits = [(pk, 0.0) for pk in qs.values_list("id", flat=True)[offset : offset + page_size]]
+
+    ranks = dict(hits)
+    results = _ordered_objects(CompanyLatestScore, [pk for pk, _ in hits])
+    for item in results:
+        item.rank = float(ranks[item.pk])
+    return total, results
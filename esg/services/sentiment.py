@@ -0,0 +1,150 @@
+"""
+Local, CPU-only lexicon sentiment scoring for ESG news.
+
+Texts are tokenised and scored column-wise with pandas string operations,
+so a batch costs a handful of vectorised passes rather than a Python loop
+per headline. Large inputs can be split across a process pool.
+"""
+
+import json
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# Same cut-offs the frontend uses to colour news items.
+POSITIVE_THRESHOLD = 0.3
+NEGATIVE_THRESHOLD = -0.3
+
+# Normalisation constant: score = raw / sqrt(raw^2 + ALPHA), as in VADER.
+ALPHA = 15.0
+
+NEGATORS = frozenset(
+    {"not", "no", "never", "without", "cannot", "nor", "isn't", "wasn't", "don't", "doesn't", "didn't", "won't"}
+)
+
+# A negator flips the polarity of terms up to this many tokens after it.
+NEGATION_WINDOW = 3
+
+DEFAULT_LEXICON: Dict[str, float] = {
+    # Positive
+    "achieve": 1.5, "achieved": 1.5, "advance": 1.2, "award": 2.0, "awarded": 2.0,
+    "benefit": 1.5, "boost": 1.5, "breakthrough": 2.2, "clean": 1.2, "committed": 1.0,
+    "compliant": 1.2, "diverse": 1.0, "diversity": 1.0, "efficient": 1.5, "efficiency": 1.5,
+    "ethical": 1.8, "exceed": 1.6, "exceeded": 1.6, "excellent": 2.5, "gain": 1.4,
+    "gains": 1.4, "good": 1.8, "great": 2.2, "green": 1.0, "grow": 1.2, "growth": 1.4,
+    "improve": 1.6, "improved": 1.6, "improvement": 1.6, "inclusive": 1.4, "innovation": 1.5,
+    "innovative": 1.5, "invest": 1.0, "investment": 1.0, "leader": 1.6, "leading": 1.3,
+    "milestone": 1.5, "positive": 2.0, "praise": 2.0, "praised": 2.0, "profit": 1.4,
+    "progress": 1.5, "protect": 1.2, "recognized": 1.5, "record": 0.8, "reduce": 0.8,
+    "reduced": 0.8, "renewable": 1.5, "resilient": 1.5, "responsible": 1.4, "restore": 1.4,
+    "safe": 1.4, "safety": 0.8, "strong": 1.6, "success": 2.0, "successful": 2.0,
+    "support": 1.2, "sustainable": 1.6, "sustainability": 1.2, "transparent": 1.6,
+    "transparency": 1.4, "upgrade": 1.3, "win": 1.8, "wins": 1.8,
+    # Negative
+    "abuse": -2.8, "accident": -2.2, "allegation": -1.8, "allegations": -1.8, "bad": -2.0,
+    "bankrupt": -3.0, "bankruptcy": -3.0, "breach": -2.4, "bribery": -3.0, "collapse": -2.6,
+    "concern": -1.2, "concerns": -1.2, "contaminated": -2.4, "contamination": -2.4,
+    "controversy": -2.0, "corruption": -3.0, "crisis": -2.5, "damage": -2.0, "decline": -1.6,
+    "declined": -1.6, "deforestation": -2.2, "delay": -1.2, "deny": -1.2, "disaster": -2.8,
+    "discrimination": -2.6, "emission": -0.6, "emissions": -0.6, "explosion": -2.6,
+    "fail": -2.0, "failed": -2.0, "failure": -2.2, "fine": -1.4, "fined": -2.2,
+    "fraud": -3.0, "harm": -2.2, "harmful": -2.2, "hazard": -2.0, "illegal": -2.6,
+    "investigation": -1.6, "lawsuit": -2.2, "layoff": -2.0, "layoffs": -2.0, "leak": -2.0,
+    "loss": -1.8, "losses": -1.8, "misconduct": -2.6, "negative": -2.0, "penalty": -2.0,
+    "pollution": -2.4, "poor": -2.0, "probe": -1.4, "protest": -1.4, "recall": -1.6,
+    "risk": -1.0, "risks": -1.0, "scandal": -2.8, "shortfall": -1.6, "spill": -2.6,
+    "strike": -1.4, "toxic": -2.6, "violation": -2.4, "violations": -2.4, "warning": -1.4,
+    "weak": -1.6, "worse": -2.0, "worst": -2.6,
+}
+
+_TOKEN_PATTERN = r"[a-z][a-z']*"
+
+
+def _lexicon_path() -> Path:
+    """Optional lexicon override at `<BASE_DIR>/models/sentiment_lexicon.json`."""
+    return Path(settings.BASE_DIR) / "models" / "sentiment_lexicon.json"
+
+
+@lru_cache(maxsize=1)
+def get_lexicon() -> Dict[str, float]:
+    """Return the scoring lexicon, merging any on-disk override once."""
+    lexicon = dict(DEFAULT_LEXICON)
+    path = _lexicon_path()
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                lexicon.update({str(k).lower(): float(v) for k, v in json.load(f).items()})
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Ignoring invalid sentiment lexicon %s: %s", path, exc)
+    return lexicon
+
+
+def _score_batch(texts: Sequence[str], lexicon: Dict[str, float]) -> List[float]:
+    """Score one batch of texts; returns values in [-1, 1]."""
+    import pandas as pd
+
+    series = pd.Series(texts, dtype="object").fillna("").astype(str).str.lower()
+    tokens = series.str.findall(_TOKEN_PATTERN).explode().dropna()
+    if tokens.empty:
+        return [0.0] * len(series)
+
+    weights = tokens.map(lexicon).fillna(0.0)
+
+    # "not a good quarter": shift the negator flags forward within each text.
+    is_negator = tokens.isin(NEGATORS)
+    grouped = is_negator.groupby(level=0)
+    negated = pd.Series(False, index=tokens.index)
+    for distance in range(1, NEGATION_WINDOW + 1):
+        negated |= grouped.shift(distance, fill_value=False).astype(bool)
+    weights = weights.where(~negated, -weights)
+
+    raw = weights.groupby(level=0).sum().reindex(series.index, fill_value=0.0)
+    normalised = raw / (raw.pow(2) + ALPHA).pow(0.5)
+    return normalised.astype(float).tolist()
+
+
+def _score_batch_worker(args: Tuple[Sequence[str], Dict[str, float]]) -> List[float]:
+    texts, lexicon = args
+    return _score_batch(texts, lexicon)
+
+
+def score_texts(texts: Sequence[str], batch_size: int = 50_000, workers: int = 1) -> List[float]:
+    """
+    Score `texts` in batches of `batch_size`, optionally over `workers`
+    processes. Results are returned in input order.
+    """
+    lexicon = get_lexicon()
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_score_batch_worker, [(batch, lexicon) for batch in batches])
+            scores: List[float] = []
+            for batch_scores in results:
+                scores.extend(batch_scores)
+            return scores
+
+    scores = []
+    for batch in batches:
+        scores.extend(_score_batch(batch, lexicon))
+    return scores
+
+
+def label_for_score(score: float) -> str:
+    """Map a score in [-1, 1] to `positive`, `negative` or `neutral`."""
+    if math.isnan(score):
+        return "neutral"
+    if score > POSITIVE_THRESHOLD:
+        return "positive"
+    if score < NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
@@ -0,0 +1,169 @@
+"""
+Startup import profiling for web workers.
+
+`profile_startup` boots Django in a fresh interpreter under `-X importtime`
+and imports the root URLconf, which loads every view module the way a
+worker does before serving its first request. It reports the import time per
+top-level package, the total import and boot time, the child's peak RSS and
+which heavy numeric libraries were loaded.
+
+`check_budget` compares a profile against `settings.ESG_STARTUP_BUDGET`.
+The `profile_startup --check` command uses it to fail CI when worker boot
+regresses, e.g. when a module-level pandas import creeps back in.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+
+# Only needed for ingestion, prediction and rescoring; read-only workers
+# should never load them.
+HEAVY_MODULES = ("numpy", "pandas", "sklearn", "scipy", "pyarrow")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_CHILD_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from importlib import import_module
+from django.conf import settings
+import_module(settings.ROOT_URLCONF)
+boot_seconds = time.perf_counter() - started
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+except ImportError:
+    peak_rss_mb = None
+import json
+print(json.dumps({
+    "boot_seconds": boot_seconds,
+    "peak_rss_mb": peak_rss_mb,
+    "packages": sorted({name.split(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    boot_seconds: float
+    peak_rss_mb: Optional[float]
+    # Top-level packages present in sys.modules once the URLconf is loaded.
+    packages: List[str] = field(default_factory=list)
+    imports: List[ImportRecord] = field(default_factory=list)
+
+    @property
+    def heavy_modules(self) -> List[str]:
+        return [name for name in HEAVY_MODULES if name in self.packages]
+
+    @property
+    def import_ms(self) -> float:
+        return sum(record.self_us for record in self.imports) / 1000
+
+    def by_package(self) -> Dict[str, float]:
+        """Import time in ms per top-level package, slowest first."""
+        totals: Dict[str, float] = defaultdict(float)
+        for record in self.imports:
+            totals[record.module.split(".")[0]] += record.self_us / 1000
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "boot_seconds": round(self.boot_seconds, 4),
+            "import_ms": round(self.import_ms, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1) if self.peak_rss_mb is not None else None,
+            "heavy_modules": self.heavy_modules,
+            "by_package": {name: round(ms, 1) for name, ms in self.by_package().items()},
+        }
+
+
+def _parse_importtime(output: str) -> List[ImportRecord]:
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(
+                ImportRecord(
+                    module=module,
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    depth=len(indent) // 2,
+                )
+            )
+    return records
+
+
+def _run_once() -> StartupProfile:
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "esg_backend.settings")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_SCRIPT],
+        cwd=str(settings.BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup profile failed:\n{completed.stderr[-2000:]}")
+
+    summary = json.loads(completed.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        boot_seconds=summary["boot_seconds"],
+        peak_rss_mb=summary["peak_rss_mb"],
+        packages=summary["packages"],
+        imports=_parse_importtime(completed.stderr),
+    )
+
+
+def profile_startup(repeat: int = 3) -> StartupProfile:
+    """Profile `repeat` fresh boots and return the one with the median boot time."""
+    runs = sorted((_run_once() for _ in range(max(1, repeat))), key=lambda run: run.boot_seconds)
+    median = runs[len(runs) // 2]
+    rss = [run.peak_rss_mb for run in runs if run.peak_rss_mb is not None]
+    if rss:
+        median.peak_rss_mb = statistics.median(rss)
+    return median
+
+
+def check_budget(
+    profile: StartupProfile,
+    budget: Optional[Dict[str, object]] = None,
+) -> List[str]:
+    """Return a description of every budget `profile` exceeds (empty if none)."""
+    budget = dict(getattr(settings, "ESG_STARTUP_BUDGET", {}), **(budget or {}))
+    violations = []
+
+    boot_ms = budget.get("boot_ms")
+    if boot_ms is not None and profile.boot_seconds * 1000 > float(boot_ms):
+        violations.append(f"boot took {profile.boot_seconds * 1000:.0f} ms (budget {boot_ms} ms)")
+
+    rss_mb = budget.get("rss_mb")
+    if rss_mb is not None and profile.peak_rss_mb is not None and profile.peak_rss_mb > float(rss_mb):
+        violations.append(f"peak RSS {profile.peak_rss_mb:.1f} MB (budget {rss_mb} MB)")
+
+    forbidden: Sequence[str] = budget.get("forbidden_modules", HEAVY_MODULES)  # type: ignore[assignment]
+    loaded = sorted(set(profile.packages) & set(forbidden))
+    if loaded:
+        violations.append(f"heavy modules imported at startup: {', '.join(loaded)}")
+    return violations
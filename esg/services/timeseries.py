@@ -0,0 +1,131 @@
+"""
+Per-company score history with optional server-side downsampling.
+
+History is returned column-wise (one list per field) so large series
+serialise compactly and map directly onto chart libraries.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from esg.models import CompanyESG
+
+
+SCORE_FIELDS = [
+    "esg_score",
+    "environmental_score",
+    "social_score",
+    "governance_score",
+    "sentiment_score",
+]
+
+
+def _bucket_mean(timestamps: List[float], columns: Dict[str, List[float]], points: int):
+    """Average consecutive rows into `points` equal-width time buckets."""
+    start, end = timestamps[0], timestamps[-1]
+    width = (end - start) / points or 1.0
+
+    sums: Dict[int, List[float]] = {}
+    for i, ts in enumerate(timestamps):
+        bucket = min(int((ts - start) / width), points - 1)
+        acc = sums.get(bucket)
+        if acc is None:
+            acc = sums[bucket] = [0.0] * (len(SCORE_FIELDS) + 2)
+        acc[0] += 1
+        acc[1] += ts
+        for j, name in enumerate(SCORE_FIELDS):
+            acc[j + 2] += columns[name][i]
+
+    out_ts: List[float] = []
+    out_cols: Dict[str, List[float]] = {name: [] for name in SCORE_FIELDS}
+    for bucket in sorted(sums):
+        acc = sums[bucket]
+        count = acc[0]
+        out_ts.append(acc[1] / count)
+        for j, name in enumerate(SCORE_FIELDS):
+            out_cols[name].append(acc[j + 2] / count)
+    return out_ts, out_cols
+
+
+def _lttb_indices(xs: List[float], ys: List[float], points: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: pick `points` indices that preserve the
+    visual shape of (xs, ys). First and last points are always kept, so
+    `points` must be at least 3.
+    """
+    n = len(xs)
+    every = (n - 2) / (points - 2)
+    selected = [0]
+    a = 0
+
+    for i in range(points - 2):
+        # Average of the next bucket acts as the third triangle vertex.
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
+
+
+def company_history(
+    company: str,
+    points: Optional[int] = None,
+    method: str = "lttb",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Dict[str, object]:
+    """
+    Return the score history of `company` as columnar arrays.
+
+    When `points` is given and the series is longer, it is downsampled with
+    either bucketed means (`mean`) or LTTB on `esg_score` (`lttb`).
+    """
+    qs = CompanyESG.objects.filter(company=company)
+    if start is not None:
+        qs = qs.filter(created_at__gte=start)
+    if end is not None:
+        qs = qs.filter(created_at__lte=end)
+    rows = qs.order_by("created_at").values_list("created_at", *SCORE_FIELDS)
+
+    timestamps: List[float] = []
+    columns: Dict[str, List[float]] = {name: [] for name in SCORE_FIELDS}
+    for row in rows.iterator(chunk_size=5000):
+        timestamps.append(row[0].timestamp())
+        for j, name in enumerate(SCORE_FIELDS):
+            columns[name].append(row[j + 1])
+
+    total = len(timestamps)
+    if points is not None and total > points:
+        if method == "mean":
+            timestamps, columns = _bucket_mean(timestamps, columns, points)
+        else:
+            keep = _lttb_indices(timestamps, columns["esg_score"], points)
+            timestamps = [timestamps[i] for i in keep]
+            columns = {name: [values[i] for i in keep] for name, values in columns.items()}
+
+    payload: Dict[str, object] = {
+        "company": company,
+        "total_points": total,
+        "returned_points": len(timestamps),
+        "timestamps": [
+            datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() for ts in timestamps
+        ],
+    }
+    payload.update(columns)
+    return payload
@@ -2,15 +2,22 @@ import json
 import logging
 import os
 import zipfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
-from typing import IO, Dict, Iterable, Tuple
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
 
-import pandas as pd
+from django.conf import settings
 from django.db import transaction
 
-from esg.models import CompanyESG, CompanyReport, ESGNews
+from esg.models import CompanyESG, CompanyReport, ESGNews, SchemaMapping
+from esg.services import data_quality
+from esg.services.analytics import AnalyticsDelta
+from esg.services.schema_registry import CompiledMapping, SchemaRegistry, get_registry
+from esg.services.sentiment import label_for_score, score_texts
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 logger = logging.getLogger(__name__)
@@ -25,12 +32,21 @@ class IngestionResult:
     companies_inserted: int = 0
     news_inserted: int = 0
     reports_inserted: int = 0
+    # One {"file", "reason"} entry per tabular file that was not ingested.
+    skipped_files: List[Dict[str, str]] = field(default_factory=list)
+    # One data quality report per validated tabular file.
+    quality: List[Dict[str, Any]] = field(default_factory=list)
+
+    def skip(self, path: Path, root: Path, reason: str) -> None:
+        self.skipped_files.append({"file": str(path.relative_to(root)), "reason": reason})
 
-    def to_dict(self) -> Dict[str, int]:
+    def to_dict(self) -> Dict[str, Any]:
         return {
             "companies_inserted": self.companies_inserted,
             "news_inserted": self.news_inserted,
             "reports_inserted": self.reports_inserted,
+            "skipped_files": self.skipped_files,
+            "quality": self.quality,
         }
 
 
@@ -57,41 +73,68 @@ def _save_uploaded_file(uploaded_file: IO[bytes]) -> Path:
     return Path(tmp.name)
 
 
-def _detect_schema(df: pd.DataFrame) -> str:
-    """
-    Detect the logical schema of a CSV DataFrame.
+TABULAR_EXTENSIONS = (".csv", ".parquet", ".feather")
 
-    Returns one of:
-    - "company_esg"
-    - "news"
-    - "" (unknown / unsupported)
-    """
-    lowered = {c.lower() for c in df.columns}
 
-    if {"company", "sentiment_score"}.issubset(lowered):
-        return "company_esg"
+def _iter_tabular_files(root: Path) -> Iterable[Path]:
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(TABULAR_EXTENSIONS):
+                yield Path(dirpath) / filename
 
-    if {"title", "sentiment_score"}.issubset(lowered):
-        return "news"
 
-    return ""
+def _columnar_schema_names(path: Path) -> list:
+    """Read only the column names of a Parquet or Feather file."""
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
 
+        return pq.read_schema(path).names
 
-def _get_column(df: pd.DataFrame, *names: str, default=None):
-    """Return a Series for the first matching column name (case-insensitive)."""
-    lowered_map = {c.lower(): c for c in df.columns}
-    for name in names:
-        key = name.lower()
-        if key in lowered_map:
-            return df[lowered_map[key]]
-    return default
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
 
+    try:
+        with ipc.open_file(path) as reader:
+            return reader.schema.names
+    except pa.ArrowInvalid:
+        # Feather V1 is not an Arrow IPC file. Its footer carries no schema
+        # pyarrow exposes on its own, so map the file instead; columns are
+        # not copied into memory.
+        return feather.read_table(path, memory_map=True).schema.names
 
-def _iter_csv_files(root: Path) -> Iterable[Path]:
-    for dirpath, _, filenames in os.walk(root):
-        for filename in filenames:
-            if filename.lower().endswith(".csv"):
-                yield Path(dirpath) / filename
+
+def _read_header(path: Path) -> List[str]:
+    """Read only the header (column names) of a tabular file."""
+    if path.suffix.lower() == ".csv":
+        import pandas as pd
+
+        return list(pd.read_csv(path, nrows=0).columns)
+    return _columnar_schema_names(path)
+
+
+def _read_table(path: Path, mapping: CompiledMapping) -> "pd.DataFrame":
+    """
+    Load the mapped columns of a tabular file, renamed to canonical fields.
+
+    CSVs are parsed with `usecols`/`dtype` hints from the mapping; Parquet and
+    Feather files (which require `pyarrow`) are read with column projection.
+    """
+    import pandas as pd
+
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        try:
+            df = pd.read_csv(path, usecols=mapping.usecols, dtype=mapping.read_dtypes)
+        except (TypeError, ValueError):
+            # A value did not fit the dtype hint; parse loosely and let the
+            # row-level conversion skip the bad rows.
+            df = pd.read_csv(path, usecols=mapping.usecols)
+    elif suffix == ".parquet":
+        df = pd.read_parquet(path, columns=mapping.usecols)
+    else:
+        df = pd.read_feather(path, columns=mapping.usecols)
+    return df.rename(columns=mapping.renames)
 
 
 def _iter_json_files(root: Path) -> Iterable[Path]:
@@ -110,115 +153,128 @@ def _parse_company_name_from_filename(path: Path) -> str:
     return path.stem
 
 
-def _ingest_company_esg(df: pd.DataFrame) -> int:
-    """Create CompanyESG rows from a DataFrame."""
-    df = df.copy()
+def _numeric(df: "pd.DataFrame", name: str, default: float = 0.0) -> "pd.Series":
+    """Column `name` as floats (unparseable values become NaN), or `default`."""
+    import pandas as pd
 
-    # Required fields
-    company_series = _get_column(df, "company")
-    sentiment_series = _get_column(df, "sentiment_score", "sentiment_score", "Sentiment_Score")
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors="coerce").astype(float)
+    return pd.Series(default, index=df.index, dtype=float)
 
-    if company_series is None or sentiment_series is None:
-        logger.warning("CSV detected as company_esg but missing required columns.")
-        return 0
 
-    # Optional fields with sensible defaults
-    environmental_series = _get_column(df, "environmental_score", "environmental", "env_score")
-    social_series = _get_column(df, "social_score", "social", "soc_score")
-    governance_series = _get_column(df, "governance_score", "governance", "gov_score")
-    esg_series = _get_column(df, "esg_score", "esg")
+def _text(df: "pd.DataFrame", name: str) -> "pd.Series":
+    """Column `name` as stripped strings, with missing values as ''."""
+    import pandas as pd
 
-    instances = []
-    for idx in range(len(df)):
-        try:
-            company = str(company_series.iloc[idx]).strip()
-            if not company:
-                continue
+    if name in df.columns:
+        return df[name].fillna("").astype(str).str.strip()
+    return pd.Series("", index=df.index, dtype=object)
+
+
+def _drop_unparsed(ok: "pd.Series", kind: str) -> None:
+    dropped = int((~ok).sum())
+    if dropped:
+        logger.warning("Dropped %s %s rows with missing or non-numeric values", dropped, kind)
 
-            sentiment = float(sentiment_series.iloc[idx])
-
-            environmental = float(environmental_series.iloc[idx]) if environmental_series is not None else 0.0
-            social = float(social_series.iloc[idx]) if social_series is not None else 0.0
-            governance = float(governance_series.iloc[idx]) if governance_series is not None else 0.0
-
-            if esg_series is not None:
-                esg_score = float(esg_series.iloc[idx])
-            else:
-                # Fallback: simple average of available components or sentiment score
-                components = [environmental, social, governance]
-                non_zero_components = [c for c in components if c != 0.0]
-                if non_zero_components:
-                    esg_score = sum(non_zero_components) / len(non_zero_components)
-                else:
-                    esg_score = sentiment
-
-            instances.append(
-                CompanyESG(
-                    company=company,
-                    sentiment_score=sentiment,
-                    environmental_score=environmental,
-                    social_score=social,
-                    governance_score=governance,
-                    esg_score=esg_score,
-                )
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to parse CompanyESG row %s: %s", idx, exc)
 
+def _ingest_company_esg(df: "pd.DataFrame", delta: AnalyticsDelta) -> int:
+    """Create CompanyESG rows from a (validated) DataFrame."""
+    import pandas as pd
+
+    if "company" not in df.columns or "sentiment_score" not in df.columns:
+        logger.warning("File detected as company_esg but missing required columns.")
+        return 0
+
+    company = _text(df, "company")
+    sentiment = _numeric(df, "sentiment_score")
+
+    # Optional fields default to 0.0.
+    environmental = _numeric(df, "environmental_score")
+    social = _numeric(df, "social_score")
+    governance = _numeric(df, "governance_score")
+
+    if "esg_score" in df.columns:
+        esg_score = _numeric(df, "esg_score")
+    else:
+        # Fallback: mean of the non-zero components, else the sentiment score.
+        components = pd.concat([environmental, social, governance], axis=1)
+        components = components.where(components != 0.0)
+        esg_score = components.mean(axis=1).fillna(sentiment)
+
+    ok = company.ne("") & sentiment.notna() & environmental.notna() & social.notna()
+    ok &= governance.notna() & esg_score.notna()
+    _drop_unparsed(ok, "CompanyESG")
+
+    instances = [
+        CompanyESG(
+            company=name,
+            sentiment_score=s,
+            environmental_score=e,
+            social_score=so,
+            governance_score=g,
+            esg_score=total,
+        )
+        for name, s, e, so, g, total in zip(
+            company[ok].tolist(),
+            sentiment[ok].tolist(),
+            environmental[ok].tolist(),
+            social[ok].tolist(),
+            governance[ok].tolist(),
+            esg_score[ok].tolist(),
+        )
+    ]
     if not instances:
         return 0
 
     CompanyESG.objects.bulk_create(instances)
+    delta.add_companies(instances)
     return len(instances)
 
 
-def _ingest_news(df: pd.DataFrame) -> int:
-    """Create ESGNews rows from a DataFrame."""
-    df = df.copy()
-
-    title_series = _get_column(df, "title")
-    summary_series = _get_column(df, "summary", "description", "body")
-    sentiment_series = _get_column(df, "sentiment_score", "sentiment")
-    label_series = _get_column(df, "sentiment_label", "label")
-
-    if title_series is None or sentiment_series is None:
-        logger.warning("CSV detected as news but missing required columns.")
+def _ingest_news(df: "pd.DataFrame", delta: AnalyticsDelta) -> int:
+    """Create ESGNews rows from a (validated) DataFrame."""
+    if "title" not in df.columns:
+        logger.warning("File detected as news but missing required columns.")
         return 0
 
-    instances = []
-    for idx in range(len(df)):
-        try:
-            title = str(title_series.iloc[idx]).strip()
-            if not title:
-                continue
-
-            summary = (
-                str(summary_series.iloc[idx]).strip()
-                if summary_series is not None
-                else ""
-            )
-            sentiment = float(sentiment_series.iloc[idx])
-            label = (
-                str(label_series.iloc[idx]).strip()
-                if label_series is not None
-                else ""
-            )
-
-            instances.append(
-                ESGNews(
-                    title=title,
-                    summary=summary,
-                    sentiment_score=sentiment,
-                    sentiment_label=label,
-                )
-            )
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to parse ESGNews row %s: %s", idx, exc)
-
+    title = _text(df, "title")
+    summary = _text(df, "summary")
+    sentiment = _numeric(df, "sentiment_score", default=float("nan"))
+
+    # Score rows without a sentiment value locally.
+    missing = sentiment.isna() & title.ne("")
+    if missing.any():
+        texts = title[missing]
+        if "summary" in df.columns:
+            texts = texts + ". " + summary[missing]
+        sentiment[missing] = score_texts(
+            texts.tolist(),
+            batch_size=getattr(settings, "ESG_SENTIMENT_BATCH_SIZE", 50_000),
+            workers=getattr(settings, "ESG_SENTIMENT_WORKERS", 1),
+        )
+
+    label = _text(df, "sentiment_label")
+    unlabelled = label.eq("") & sentiment.notna()
+    if unlabelled.any():
+        label[unlabelled] = sentiment[unlabelled].map(label_for_score)
+
+    ok = title.ne("") & sentiment.notna()
+    _drop_unparsed(ok, "ESGNews")
+
+    instances = [
+        ESGNews(title=t, summary=su, sentiment_score=s, sentiment_label=lb)
+        for t, su, s, lb in zip(
+            title[ok].tolist(),
+            summary[ok].tolist(),
+            sentiment[ok].tolist(),
+            label[ok].tolist(),
+        )
+    ]
     if not instances:
         return 0
 
     ESGNews.objects.bulk_create(instances)
+    delta.add_news(instances)
     return len(instances)
 
 
@@ -243,71 +299,138 @@ def _ingest_json_reports(root: Path) -> int:
     return len(instances)
 
 
-def _ingest_csvs(root: Path) -> Tuple[int, int]:
-    """Process all CSVs, returning (companies_inserted, news_inserted)."""
+def _ingest_tabular_files(
+    root: Path,
+    delta: AnalyticsDelta,
+    result: IngestionResult,
+    registry: SchemaRegistry,
+    quarantine_paths: List[Path],
+) -> Tuple[int, int]:
+    """
+    Process all CSV, Parquet and Feather files, returning
+    (companies_inserted, news_inserted). Files that cannot be read, match
+    no registered schema or fail validation are recorded in
+    `result.skipped_files`; every validated file gets a report in
+    `result.quality`. Quarantine CSVs written along the way are appended to
+    `quarantine_paths`.
+    """
     companies_inserted = 0
     news_inserted = 0
+    quality_config = data_quality.quality_settings()
 
-    for path in _iter_csv_files(root):
+    for path in _iter_tabular_files(root):
         try:
-            df = pd.read_csv(path)
+            mapping = registry.match(_read_header(path))
+            if mapping is None:
+                logger.info("Skipping unsupported schema in %s", path)
+                result.skip(path, root, "No registered schema matches the header.")
+                continue
+            df = _read_table(path, mapping)
+        except ImportError:
+            logger.warning("Skipping %s: reading columnar files requires pyarrow", path)
+            result.skip(path, root, "Reading columnar files requires pyarrow.")
+            continue
         except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to read CSV %s: %s", path, exc)
+            logger.warning("Failed to read %s: %s", path, exc)
+            result.skip(path, root, f"Could not be read: {exc}")
             continue
 
-        schema = _detect_schema(df)
-        if schema == "company_esg":
-            companies_inserted += _ingest_company_esg(df)
-        elif schema == "news":
-            news_inserted += _ingest_news(df)
-        else:
-            logger.info("Skipping unsupported CSV schema in %s", path)
+        name = str(path.relative_to(root))
+        keep, errors, report = data_quality.validate(df, mapping.target, name)
 
-    return companies_inserted, news_inserted
+        if report.invalid_ratio > quality_config["max_invalid_ratio"]:
+            report.status = "rejected"
+            reason = f"{report.quarantined} of {report.rows} rows failed data quality checks."
+            if quality_config["fail_upload"]:
+                raise IngestionError(f"{name}: {reason}")
+            result.skip(path, root, reason)
+            result.quality.append(report.to_dict())
+            continue
 
+        if report.quarantined:
+            quarantine_path = data_quality.write_quarantine(df, errors, ~keep, name)
+            quarantine_paths.append(quarantine_path)
+            report.quarantine_file = quarantine_path.name
+        df = df[keep]
 
-def ingest_zip_file(uploaded_file: IO[bytes]) -> IngestionResult:
-    """
-    Main ingestion entrypoint.
+        if mapping.target == SchemaMapping.TARGET_COMPANY_ESG:
+            report.inserted = _ingest_company_esg(df, delta)
+            companies_inserted += report.inserted
+        elif mapping.target == SchemaMapping.TARGET_NEWS:
+            report.inserted = _ingest_news(df, delta)
+            news_inserted += report.inserted
+        result.quality.append(report.to_dict())
 
-    1. Persist uploaded ZIP to disk.
-    2. Extract into a temporary directory.
-    3. Ingest CSV- and JSON-based ESG data.
-    4. Clean up all temporary resources.
-    """
-    tmp_path = _save_uploaded_file(uploaded_file)
+    return companies_inserted, news_inserted
 
-    if not zipfile.is_zipfile(tmp_path):
+
+def _remove_files(paths: Iterable[Path]) -> None:
+    for path in paths:
         try:
-            os.remove(tmp_path)
+            os.remove(path)
         except OSError:
-            logger.warning("Failed to delete invalid ZIP temp file %s", tmp_path)
+            logger.warning("Failed to delete quarantine file %s", path)
+
+
+def ingest_zip_path(zip_path: Path) -> IngestionResult:
+    """
+    Ingest a ZIP archive that is already on disk.
+
+    1. Extract into a temporary directory.
+    2. Ingest CSV-, Parquet-, Feather- and JSON-based ESG data.
+    3. Update the analytics summary tables in the same transaction.
+
+    If the transaction rolls back, the quarantine CSVs it wrote are removed.
+    The archive itself is left in place; callers own its lifecycle.
+    """
+    if not zipfile.is_zipfile(zip_path):
         raise IngestionError("Uploaded file is not a valid ZIP archive.")
 
     result = IngestionResult()
+    registry = get_registry()
 
-    try:
-        with TemporaryDirectory() as extract_dir:
-            extract_root = Path(extract_dir)
+    with TemporaryDirectory() as extract_dir:
+        extract_root = Path(extract_dir)
 
-            try:
-                with zipfile.ZipFile(tmp_path, "r") as zf:
-                    zf.extractall(extract_root)
-            except zipfile.BadZipFile as exc:
-                raise IngestionError("Could not read ZIP archive.") from exc
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zf:
+                zf.extractall(extract_root)
+        except zipfile.BadZipFile as exc:
+            raise IngestionError("Could not read ZIP archive.") from exc
 
+        quarantine_paths: List[Path] = []
+        try:
             with transaction.atomic():
-                companies, news = _ingest_csvs(extract_root)
+                delta = AnalyticsDelta()
+                companies, news = _ingest_tabular_files(
+                    extract_root, delta, result, registry, quarantine_paths
+                )
                 reports = _ingest_json_reports(extract_root)
+                delta.apply()
+        except Exception:
+            _remove_files(quarantine_paths)
+            raise
 
-            result.companies_inserted = companies
-            result.news_inserted = news
-            result.reports_inserted = reports
+        result.companies_inserted = companies
+        result.news_inserted = news
+        result.reports_inserted = reports
+
+    return result
+
+
+def ingest_zip_file(uploaded_file: IO[bytes]) -> IngestionResult:
+    """
+    Main ingestion entrypoint for uploaded file objects.
+
+    Persists the upload to a temporary file, ingests it with
+    `ingest_zip_path` and always removes the temporary file afterwards.
+    """
+    tmp_path = _save_uploaded_file(uploaded_file)
+
+    try:
+        return ingest_zip_path(tmp_path)
     finally:
         try:
             os.remove(tmp_path)
         except OSError:
             logger.warning("Failed to delete temporary ZIP file %s", tmp_path)
-
-    return result
-
@@ -1,23 +1,55 @@
 from django.urls import path
 
 from .views import (
+    AnalyticsOverviewView,
+    AnalyticsRankingView,
+    AnalyticsSentimentView,
+    AnalyticsTrendsView,
     CompanyDetailView,
+    CompanyHistoryView,
     CompanyListView,
     CompanyReportView,
+    CompanySearchView,
+    ESGExplainBatchView,
+    ESGExplainView,
     ESGPredictView,
     NewsListView,
+    NewsSearchView,
+    ParquetExportView,
+    RescoreView,
     UploadPageView,
+    UploadSessionCompleteView,
+    UploadSessionCreateView,
+    UploadSessionView,
     UploadZipView,
 )
 
 
 urlpatterns = [
     path("upload-zip/", UploadZipView.as_view(), name="upload-zip"),
+    path("uploads/", UploadSessionCreateView.as_view(), name="upload-session-create"),
+    path("uploads/<uuid:upload_id>/", UploadSessionView.as_view(), name="upload-session"),
+    path(
+        "uploads/<uuid:upload_id>/complete/",
+        UploadSessionCompleteView.as_view(),
+        name="upload-session-complete",
+    ),
     path("companies/", CompanyListView.as_view(), name="company-list"),
     path("companies/<int:pk>/", CompanyDetailView.as_view(), name="company-detail"),
+    path("companies/<str:company>/history/", CompanyHistoryView.as_view(), name="company-history"),
     path("news/", NewsListView.as_view(), name="news-list"),
+    path("search/news/", NewsSearchView.as_view(), name="news-search"),
+    path("search/companies/", CompanySearchView.as_view(), name="company-search"),
     path("reports/<str:company>/", CompanyReportView.as_view(), name="company-report"),
     path("predict/", ESGPredictView.as_view(), name="esg-predict"),
+    path("predict/explain/", ESGExplainView.as_view(), name="esg-explain"),
+    path("predict/explain/batch/", ESGExplainBatchView.as_view(), name="esg-explain-batch"),
+    path("analytics/overview/", AnalyticsOverviewView.as_view(), name="analytics-overview"),
+    path("analytics/ranking/", AnalyticsRankingView.as_view(), name="analytics-ranking"),
+    path("analytics/sentiment/", AnalyticsSentimentView.as_view(), name="analytics-sentiment"),
+    path("analytics/trends/", AnalyticsTrendsView.as_view(), name="analytics-trends"),
+    path("export/<str:dataset>.parquet", ParquetExportView.as_view(), name="parquet-export"),
+    path("rescore/", RescoreView.as_view(), name="rescore"),
     path("upload-page/", UploadPageView.as_view(), name="upload-page"),
 ]
 
@@ -1,22 +1,36 @@
+from datetime import timedelta
+from importlib.util import find_spec
 from typing import Any, Dict
 
+from django.conf import settings
 from django.db.models import F
-from django.http import Http404
-from django.shortcuts import render
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
 from django.views import View
 from rest_framework import generics, status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import CompanyESG, CompanyReport, ESGNews
+from .models import CompanyESG, CompanyReport, ESGNews, RescoreCheckpoint, UploadSession
 from .serializers import (
     CompanyESGListSerializer,
     CompanyESGSerializer,
+    CompanyHistoryQuerySerializer,
+    CompanyLatestScoreSerializer,
     CompanyReportSerializer,
+    CompanySearchResultSerializer,
+    ESGNewsSearchResultSerializer,
+    ESGExplainBatchRequestSerializer,
     ESGNewsSerializer,
     ESGPredictRequestSerializer,
+    RescoreCheckpointSerializer,
+    SearchQuerySerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer,
 )
+from .services import analytics, chunked_upload, explain, export, rescoring, search, timeseries
 from .services.model_loader import get_esg_model
 from .services.zip_ingestion import IngestionError, ingest_zip_file
 
@@ -74,6 +88,101 @@ class UploadZipView(APIView):
         return Response(payload, status=status.HTTP_200_OK)
 
 
+class UploadSessionCreateView(APIView):
+    """
+    Start a resumable chunked ZIP upload.
+
+    Expects JSON `{filename, size, checksum?}` where `checksum` is the hex
+    SHA-256 of the whole archive. Returns the `upload_id`, the current
+    `offset` and the recommended `chunk_size`.
+    """
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            session = chunked_upload.create_session(
+                data["filename"], data["size"], data.get("checksum", "")
+            )
+        except chunked_upload.UploadSessionError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        payload = UploadSessionSerializer(session).data
+        payload["chunk_size"] = settings.ESG_UPLOAD_CHUNK_SIZE
+        return Response(payload, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionView(APIView):
+    """
+    Inspect or append to a resumable upload.
+
+    GET returns the session, including the `offset` to resume from.
+    PUT appends the raw request body at the `Upload-Offset` header, verified
+    against the optional `Upload-Checksum` header (hex SHA-256 of the chunk).
+    """
+
+    def get(self, request: Request, upload_id, *args: Any, **kwargs: Any) -> Response:
+        session = get_object_or_404(UploadSession, pk=upload_id)
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_200_OK)
+
+    def put(self, request: Request, upload_id, *args: Any, **kwargs: Any) -> Response:
+        get_object_or_404(UploadSession, pk=upload_id)
+        try:
+            offset = int(request.META.get("HTTP_UPLOAD_OFFSET", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return Response(
+                {"detail": "A numeric `Upload-Offset` header is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            session = chunked_upload.write_chunk(
+                upload_id,
+                offset,
+                request.stream,
+                length,
+                checksum=request.META.get("HTTP_UPLOAD_CHECKSUM"),
+            )
+        except chunked_upload.OffsetMismatchError as exc:
+            return Response(
+                {"detail": str(exc), "offset": exc.expected},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except chunked_upload.UploadSessionError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_200_OK)
+
+
+class UploadSessionCompleteView(APIView):
+    """Finalise a fully received upload and ingest the assembled ZIP."""
+
+    def post(self, request: Request, upload_id, *args: Any, **kwargs: Any) -> Response:
+        get_object_or_404(UploadSession, pk=upload_id)
+        try:
+            ingestion_result = chunked_upload.finalize_session(upload_id)
+        except (chunked_upload.UploadSessionError, IngestionError) as exc:
+            return Response(
+                {"status": "error", "detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception:  # noqa: BLE001
+            return Response(
+                {
+                    "status": "error",
+                    "detail": "An unexpected error occurred while processing the ZIP file.",
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        payload: Dict[str, Any] = {"status": "success"}
+        payload.update(ingestion_result.to_dict())
+        return Response(payload, status=status.HTTP_200_OK)
+
+
 class CompanyListView(generics.ListAPIView):
     """
     List latest ESG scores for all companies.
@@ -98,6 +207,33 @@ class CompanyDetailView(generics.RetrieveAPIView):
     serializer_class = CompanyESGSerializer
 
 
+class CompanyHistoryView(APIView):
+    """
+    Return a company's score history as columnar arrays, oldest first.
+
+    Query params: `points` (downsample target, min 3), `method` (`lttb` or
+    `mean`), and optional ISO-8601 `start` / `end` bounds.
+    """
+
+    def get(self, request: Request, company: str, *args: Any, **kwargs: Any) -> Response:
+        serializer = CompanyHistoryQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        history = timeseries.company_history(
+            company,
+            points=params.get("points"),
+            method=params["method"],
+            start=params.get("start"),
+            end=params.get("end"),
+        )
+        # An empty start/end window is a valid, empty series; only unknown
+        # companies are a 404.
+        if not history["total_points"] and not CompanyESG.objects.filter(company=company).exists():
+            raise Http404("No ESG history found for the specified company.")
+        return Response(history, status=status.HTTP_200_OK)
+
+
 class NewsListView(generics.ListAPIView):
     """Return all ESG-related news sentiment entries."""
 
@@ -161,3 +297,205 @@ class ESGPredictView(APIView):
             status=status.HTTP_200_OK,
         )
 
+
+def _int_query_param(request: Request, name: str, default: int, maximum: int) -> int:
+    """Parse a positive integer query parameter, clamped to `maximum`."""
+    try:
+        value = int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(1, min(value, maximum))
+
+
+class AnalyticsOverviewView(APIView):
+    """Return overall averages across the latest score of every company."""
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(analytics.overview(), status=status.HTTP_200_OK)
+
+
+class AnalyticsRankingView(APIView):
+    """
+    Return the top or bottom N companies by their latest ESG score.
+
+    Query params: `n` (default 5, max 100) and `order` (`top` or `bottom`).
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        limit = _int_query_param(request, "n", default=5, maximum=100)
+        ascending = request.query_params.get("order", "top").lower() == "bottom"
+        rows = analytics.ranked_companies(limit, ascending=ascending)
+        serializer = CompanyLatestScoreSerializer(rows, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AnalyticsSentimentView(APIView):
+    """Return the news sentiment label histogram."""
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(analytics.sentiment_histogram(), status=status.HTTP_200_OK)
+
+
+class AnalyticsTrendsView(APIView):
+    """
+    Return daily average scores of ingested CompanyESG rows.
+
+    Query params: `days` (default 30, max 3650).
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        days = _int_query_param(request, "days", default=30, maximum=3650)
+        since = timezone.now().date() - timedelta(days=days - 1)
+        return Response(analytics.daily_trends(since), status=status.HTTP_200_OK)
+
+
+class ESGExplainView(APIView):
+    """
+    Explain an ESG prediction as per-feature contributions.
+
+    Accepts the same body as `/predict/`. The response satisfies
+    `base_value + sum(contributions) == predicted_esg_score`.
+    """
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = ESGPredictRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return _explain_response([serializer.validated_data], many=False)
+
+
+class ESGExplainBatchView(APIView):
+    """Explain up to 1000 predictions at once; expects `{"items": [...]}`."""
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = ESGExplainBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return _explain_response(serializer.validated_data["items"], many=True)
+
+
+def _explain_response(rows, many: bool) -> Response:
+    try:
+        explanations = explain.explain(rows)
+    except explain.ExplainError:
+        return Response(
+            {
+                "detail": "Prediction model is not available. "
+                "Ensure the `models/esg_model.pkl` file exists and is valid.",
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    except Exception:  # noqa: BLE001
+        return Response(
+            {"detail": "Failed to explain predictions from the ESG model."},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    payload = {"results": explanations} if many else explanations[0]
+    return Response(payload, status=status.HTTP_200_OK)
+
+
+class NewsSearchView(APIView):
+    """
+    Ranked full-text search over news titles and summaries.
+
+    Query params: `q` (required), `page` (default 1), `page_size` (default 20,
+    max 100).
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        total, results = search.search_news(params["q"], params["page"], params["page_size"])
+        return Response(
+            {
+                "count": total,
+                "page": params["page"],
+                "page_size": params["page_size"],
+                "results": ESGNewsSearchResultSerializer(results, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class CompanySearchView(APIView):
+    """
+    Fuzzy search over company names, best matches first.
+
+    Query params: `q` (required), `page` (default 1), `page_size` (default 20,
+    max 100).
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        total, results = search.search_companies(params["q"], params["page"], params["page_size"])
+        return Response(
+            {
+                "count": total,
+                "page": params["page"],
+                "page_size": params["page_size"],
+                "results": CompanySearchResultSerializer(results, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ParquetExportView(APIView):
+    """
+    Stream CompanyESG (`companies`) or ESGNews (`news`) rows as a Parquet
+    file, one row group at a time.
+    """
+
+    def get(self, request: Request, dataset: str, *args: Any, **kwargs: Any):
+        if dataset not in export.EXPORT_FIELDS:
+            raise Http404("Unknown export dataset.")
+
+        if find_spec("pyarrow") is None:
+            return Response(
+                {"detail": "Parquet export is not available. Install `pyarrow`."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        response = StreamingHttpResponse(
+            export.stream_parquet(dataset),
+            content_type="application/vnd.apache.parquet",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.parquet"'
+        return response
+
+
+class RescoreView(APIView):
+    """
+    Inspect or start batch rescoring of historical CompanyESG rows.
+
+    GET lists the checkpoint of every model version scored so far. POST
+    starts a background run for the currently loaded model, resuming from
+    its checkpoint.
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = RescoreCheckpointSerializer(RescoreCheckpoint.objects.all(), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if get_esg_model() is None:
+            return Response(
+                {
+                    "detail": "Prediction model is not available. "
+                    "Ensure the `models/esg_model.pkl` file exists and is valid.",
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        try:
+            version = rescoring.start_background_rescore()
+        except rescoring.RescoreError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+
+        return Response(
+            {"status": "started", "model_version": version},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -34,6 +34,8 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    # Adds ETags to API responses and answers If-None-Match with 304.
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -89,6 +91,30 @@ else:
         }
     }
 
+# Prediction explanations get their own cache alias: the default LocMemCache
+# holds only 300 entries, fewer than one 1000-item batch explain request.
+# Set REDIS_URL (requires the `redis` package) to share the cache across
+# workers instead of keeping a copy per process.
+REDIS_URL = os.getenv("REDIS_URL")
+ESG_EXPLAIN_CACHE_MAX_ENTRIES = int(os.getenv("ESG_EXPLAIN_CACHE_MAX_ENTRIES", "50000"))
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "explanations": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "esg",
+        }
+        if REDIS_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "esg-explanations",
+            "OPTIONS": {"MAX_ENTRIES": ESG_EXPLAIN_CACHE_MAX_ENTRIES},
+        }
+    ),
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -137,9 +163,64 @@ REST_FRAMEWORK = {
     ],
 }
 
-# Allow large ZIP uploads (up to ~500 MB)
-DATA_UPLOAD_MAX_MEMORY_SIZE = 524_288_000
-FILE_UPLOAD_MAX_MEMORY_SIZE = 524_288_000
+# Keep request bodies out of worker memory: multipart files above 10 MB are
+# spooled to a temporary file. Large archives should use the resumable
+# chunked upload API (/api/uploads/), which streams chunks straight to disk.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10_485_760
+FILE_UPLOAD_MAX_MEMORY_SIZE = 10_485_760
+
+ESG_UPLOAD_STAGING_DIR = Path(os.getenv("ESG_UPLOAD_STAGING_DIR", MEDIA_ROOT / "uploads"))
+ESG_UPLOAD_CHUNK_SIZE = int(os.getenv("ESG_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+ESG_UPLOAD_MAX_SIZE = int(os.getenv("ESG_UPLOAD_MAX_SIZE", str(20 * 1024**3)))
+
+
+# Extra tabular schema mappings for vendor formats, checked before the
+# built-in ones (SchemaMapping rows in the database take precedence), e.g.
+# {"name": "vendor_x", "target": "company_esg",
+#  "columns": {"company": ["issuer"], "sentiment_score": ["tone"], "esg_score": ["total"]},
+#  "required": ["company", "sentiment_score"], "dtypes": {"esg_score": "float64"}}
+# Invalid mappings are logged and ignored (see schema_registry.mapping_errors).
+ESG_SCHEMA_MAPPINGS: list = []
+
+# Local sentiment scoring for news uploaded without a sentiment column.
+# Set ESG_SENTIMENT_WORKERS > 1 to score large files across processes.
+ESG_SENTIMENT_BATCH_SIZE = int(os.getenv("ESG_SENTIMENT_BATCH_SIZE", "50000"))
+ESG_SENTIMENT_WORKERS = int(os.getenv("ESG_SENTIMENT_WORKERS", "1"))
+
+# A rescoring run that has not committed a chunk for this long is treated as
+# dead (e.g. its worker was killed) and may be taken over by a new run.
+ESG_RESCORE_STALE_SECONDS = int(os.getenv("ESG_RESCORE_STALE_SECONDS", "600"))
+
+# Ingestion data quality rules (see esg/services/data_quality.py). Rows failing
+# a rule are quarantined to CSVs under ESG_QUARANTINE_DIR. A file whose share
+# of quarantined rows exceeds max_invalid_ratio is skipped; with fail_upload
+# the whole upload is rejected instead. "rules" replaces the default rules
+# per target, e.g. {"news": [{"rule": "required", "field": "title"}]}.
+ESG_DATA_QUALITY = {
+    "max_invalid_ratio": float(os.getenv("ESG_DATA_QUALITY_MAX_INVALID_RATIO", "0.5")),
+    "fail_upload": os.getenv("ESG_DATA_QUALITY_FAIL_UPLOAD", "False").lower() in {"1", "true", "yes"},
+    "sample_rows": 5,
+    "rules": {},
+}
+ESG_QUARANTINE_DIR = Path(os.getenv("ESG_QUARANTINE_DIR", MEDIA_ROOT / "quarantine"))
+
+# Data lifecycle (`apply_retention`): CompanyESG snapshots older than
+# ESG_RETENTION_COMPACT_AFTER_DAYS are thinned to one per company per
+# ESG_RETENTION_PERIOD, and rows older than ESG_RETENTION_ARCHIVE_AFTER_DAYS
+# are moved to gzip'd JSON Lines files under ESG_ARCHIVE_DIR. 0 disables a step.
+ESG_ARCHIVE_DIR = Path(os.getenv("ESG_ARCHIVE_DIR", BASE_DIR / "archive"))
+ESG_RETENTION_PERIOD = os.getenv("ESG_RETENTION_PERIOD", "month")
+ESG_RETENTION_COMPACT_AFTER_DAYS = int(os.getenv("ESG_RETENTION_COMPACT_AFTER_DAYS", "365"))
+ESG_RETENTION_ARCHIVE_AFTER_DAYS = int(os.getenv("ESG_RETENTION_ARCHIVE_AFTER_DAYS", "1095"))
+
+# Worker boot budget checked by `profile_startup --check`. numpy, pandas,
+# sklearn and friends are imported lazily by the ingestion, prediction and
+# rescoring paths and must not be loaded just by importing the URLconf.
+ESG_STARTUP_BUDGET = {
+    "boot_ms": int(os.getenv("ESG_STARTUP_BUDGET_BOOT_MS", "1000")),
+    "rss_mb": int(os.getenv("ESG_STARTUP_BUDGET_RSS_MB", "80")),
+    "forbidden_modules": ["numpy", "pandas", "sklearn", "scipy", "pyarrow"],
+}
 
 
 # CORS Configuration
@@ -169,6 +250,12 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "upload-offset",
+    "upload-checksum",
+    "if-none-match",
 ]
 
+# Let the frontend read ETags for conditional revalidation.
+CORS_EXPOSE_HEADERS = ["etag"]
+
 